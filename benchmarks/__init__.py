@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks measuring the overhead slumber adds on top of requests.
+
+Run them all, and write the results as JSON, with::
+
+    python -m benchmarks --output results.json
+
+Pass ``--compare old.json`` to see how they moved since a previous run, and
+``--check benchmarks/baseline.json`` to fail when slumber got slower than the
+recorded baseline of the overhead suite (by more than ``--tolerance``)::
+
+    python -m benchmarks overhead --check benchmarks/baseline.json
+"""
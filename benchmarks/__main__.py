@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, unicode_literals
+
+import argparse, json, platform, sys, time
+
+from . import end_to_end, overhead, serializers, transports
+
+SUITES = {
+    "overhead": overhead.run,
+    "serializers": serializers.run,
+    "end_to_end": end_to_end.run,
+    "transports": transports.run,
+}
+
+
+def get_timing(result):
+    for key in ("slumber_seconds", "loads_seconds", "urllib3_cpu_seconds"):
+        if key in result:
+            return key, result[key]
+    if "slumber" in result:
+        return "slumber.p50", result["slumber"]["p50"]
+    return None, None
+
+
+def print_comparison(results, previous):
+    old = dict((r["name"], r) for suite in previous["suites"].values() for r in suite)
+    for suite in results["suites"].values():
+        for result in suite:
+            key, new_value = get_timing(result)
+            old_value = get_timing(old[result["name"]])[1] if result["name"] in old else None
+            if old_value:
+                print("%-40s %-16s %+7.1f%%" % (result["name"], key, (new_value / old_value - 1) * 100),
+                      file=sys.stderr)
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Returns the names of the results slower than in ``baseline`` by more than
+    ``tolerance``. Ratios to raw requests are compared when both runs have one, as
+    they hold better across machines than timings.
+    """
+    old = dict((r["name"], r) for suite in baseline["suites"].values() for r in suite)
+    regressions = []
+    for suite in results["suites"].values():
+        for result in suite:
+            if result["name"] not in old:
+                continue
+            if result.get("ratio") and old[result["name"]].get("ratio"):
+                new_value, old_value = result["ratio"], old[result["name"]]["ratio"]
+            else:
+                new_value, old_value = get_timing(result)[1], get_timing(old[result["name"]])[1]
+            if old_value and new_value > old_value * (1 + tolerance):
+                regressions.append(result["name"])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("suites", nargs="*", metavar="suite", help="%s, all by default" % ", ".join(sorted(SUITES)))
+    parser.add_argument("--output", help="file to write the JSON results to, stdout by default")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--check", metavar="BASELINE",
+                        help="JSON results to fail on regressions against, such as benchmarks/baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="slowdown allowed by --check, 0.5 (50%%) by default")
+    args = parser.parse_args(argv)
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error("unknown suite %s" % name)
+
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "timestamp": int(time.time()),
+        "suites": dict((name, SUITES[name]()) for name in args.suites or sorted(SUITES)),
+    }
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+    if args.check:
+        with open(args.check) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Slower than the baseline: %s" % ", ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput and latency of get and post against a local server, with slumber
+and with raw requests.
+"""
+
+from __future__ import division, unicode_literals
+
+import json, time
+
+import requests
+
+import slumber
+
+from .server import LocalServer
+from .utils import percentiles
+
+
+def sample(func, count):
+    latencies = []
+    started = time.time()
+    for _ in range(count):
+        before = time.time()
+        func()
+        latencies.append(time.time() - before)
+    elapsed = time.time() - started
+    result = {"requests_per_second": count / elapsed}
+    result.update(percentiles(latencies))
+    return result
+
+
+def run(count=1000, sizes=(1, 100)):
+    results = []
+    with LocalServer() as server:
+        api = slumber.API(server.url + "api/")
+        session = requests.Session()
+        url = server.url + "api/thing/"
+        data = {"name": "object", "tags": ["a", "b"]}
+
+        for size in sizes:
+            # Warm up the connections.
+            api.thing.get(size=size)
+            session.get(url, params={"size": size}).json()
+
+            results.append({
+                "name": "get.%d" % size,
+                "slumber": sample(lambda: api.thing.get(size=size), count),
+                "requests": sample(lambda: session.get(url, params={"size": size}).json(), count),
+            })
+
+        def raw_post():
+            headers = {"accept": "application/json", "content-type": "application/json"}
+            return session.post(url, data=json.dumps(data), headers=headers).json()
+
+        results.append({
+            "name": "post",
+            "slumber": sample(lambda: api.thing.post(data), count),
+            "requests": sample(raw_post, count),
+        })
+    return results
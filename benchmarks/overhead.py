@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Client side work slumber does around each request, compared with doing the
+same by hand with requests.
+"""
+
+from __future__ import unicode_literals
+
+import itertools, json
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import slumber
+
+from .server import make_objects
+from .utils import compare, measure
+
+BASE_URL = "http://127.0.0.1:8000/api/v1/"
+
+
+def make_response(body, content_type="application/json"):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"content-type": content_type})
+    response._content = body
+    return response
+
+
+def bench_navigation():
+    api = slumber.API(BASE_URL)
+    ids = itertools.count()
+
+    return [
+        compare("navigation.getattr", measure(lambda: api.a.b.c), measure(lambda: BASE_URL + "a/b/c/")),
+        compare("navigation.call", measure(lambda: api.thing(next(ids))),
+                measure(lambda: "%sthing/%d/" % (BASE_URL, next(ids)))),
+        compare("navigation.url_join", measure(lambda: slumber.url_join(BASE_URL, "thing")),
+                measure(lambda: BASE_URL + "thing")),
+    ]
+
+
+def bench_prepare_request():
+    api = slumber.API(BASE_URL, token={"token_type": "Bearer", "access_token": "secret"})
+    resource = api.thing(1)
+    data = {"name": "object", "tags": ["a", "b"]}
+
+    def by_hand():
+        return BASE_URL + "thing/1/", {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "Authorization": "Bearer secret",
+        }, json.dumps(data)
+
+    return [compare("request.prepare", measure(lambda: resource._prepare_request(data=data)), measure(by_hand))]
+
+
+class StaticSession(object):
+    """
+    A session answering every request with the same response, so that only
+    the work done around sending it is measured.
+    """
+
+    auth, headers = None, {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def request(self, method, url, **kwargs):
+        return self.response
+
+
+def bench_request():
+    response = make_response(b'{"id": 1, "name": "object"}')
+    session = StaticSession(response)
+    resource = slumber.API(BASE_URL, session=session).thing
+    data = {"name": "object", "tags": ["a", "b"]}
+    headers = {"accept": "application/json", "content-type": "application/json"}
+
+    def get_by_hand():
+        return session.request("GET", BASE_URL + "thing/", headers=headers).json()
+
+    def post_by_hand():
+        return session.request("POST", BASE_URL + "thing/", data=json.dumps(data), headers=headers).json()
+
+    return [
+        compare("request.get", measure(lambda: resource.get()), measure(get_by_hand)),
+        compare("request.post", measure(lambda: resource.post(data)), measure(post_by_hand)),
+    ]
+
+
+def bench_deserialize(sizes=(1, 100, 10000)):
+    resource = slumber.API(BASE_URL).thing
+    results = []
+    for size in sizes:
+        response = make_response(json.dumps({"objects": make_objects(size)}).encode("utf-8"))
+        results.append(compare("response.deserialize.%d" % size,
+                               measure(lambda: resource._try_to_serialize_response(response)),
+                               measure(lambda: response.json())))
+    return results
+
+
+def run():
+    return bench_navigation() + bench_prepare_request() + bench_request() + bench_deserialize()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Encode and decode speed of the serializers, and of each JSON backend.
+"""
+
+from __future__ import unicode_literals
+
+import slumber.serialize
+
+from .server import make_objects
+from .utils import measure
+
+
+def get_serializers():
+    for backend in ("json", "ujson", "orjson"):
+        if slumber.serialize._import(backend) is not None:
+            yield "json-%s" % backend, slumber.serialize.JsonSerializer(backend=backend)
+    if slumber.serialize.is_available("yaml"):
+        yield "yaml", slumber.serialize.YamlSerializer()
+    if slumber.serialize.is_available("msgpack"):
+        yield "msgpack", slumber.serialize.MsgpackSerializer()
+
+
+def run(sizes=(10, 1000, 10000)):
+    results = []
+    for name, s in get_serializers():
+        for size in sizes:
+            if name == "yaml" and size > 1000:
+                # Takes seconds and tells nothing more.
+                continue
+            payload = {"meta": {"limit": size, "offset": 0, "next": None}, "objects": make_objects(size)}
+            encoded = s.dumps(payload)
+            if name == "yaml":
+                # yaml.dump tags unicode strings on Python 2, which safe_load refuses.
+                encoded = slumber.serialize._import("yaml").safe_dump(payload)
+            if not isinstance(encoded, bytes):
+                encoded = encoded.encode("utf-8")
+            results.append({
+                "name": "serializer.%s.%d" % (name, size),
+                "bytes": len(encoded),
+                "dumps_seconds": measure(lambda: s.dumps(payload)),
+                "loads_seconds": measure(lambda: s.loads(encoded)),
+            })
+    return results
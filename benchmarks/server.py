@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+A small keep-alive HTTP server answering JSON, run in a background thread.
+
+GET returns a list of ``size`` objects (``?size=N``, 10 by default), POST
+and PUT answer the length of the body they received.
+"""
+
+from __future__ import unicode_literals
+
+import json, socket, threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlsplit
+
+
+def make_objects(size):
+    return [
+        {"id": i, "name": "object %d" % i, "price": i * 1.5, "active": i % 2 == 0, "tags": ["a", "b", "c"]}
+        for i in range(size)
+    ]
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    # Send each response in one go rather than a write per header, which
+    # would otherwise wait for delayed ACKs.
+    wbufsize = -1
+    bodies = {}
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def send_json(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        size = int(parse_qs(urlsplit(self.path).query).get("size", ["10"])[0])
+        if size not in self.bodies:
+            self.bodies[size] = json.dumps({"objects": make_objects(size)}).encode("utf-8")
+        self.send_json(self.bodies[size])
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.send_json(json.dumps({"received": length}).encode("utf-8"))
+
+    do_PUT = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class LocalServer(object):
+    """
+    Context manager starting the server on a free port of localhost.
+    """
+
+    def __enter__(self):
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = "http://127.0.0.1:%d/" % self.server.server_address[1]
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
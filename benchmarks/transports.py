@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Client CPU time per request with the default requests session and with the
+urllib3 transport, against a local server.
+"""
+
+from __future__ import division, unicode_literals
+
+import time
+
+import slumber
+from slumber.transport import Urllib3Transport
+
+from .server import LocalServer
+
+try:
+    # Only the requesting thread, the server runs in this process too.
+    from time import CLOCK_THREAD_CPUTIME_ID, clock_gettime
+
+    def cpu_time():
+        return clock_gettime(CLOCK_THREAD_CPUTIME_ID)
+except ImportError:
+    cpu_time = time.time
+
+
+def cpu_per_call(func, count):
+    func()
+    started = cpu_time()
+    for _ in range(count):
+        func()
+    return (cpu_time() - started) / count
+
+
+def run(count=1000):
+    results = []
+    with LocalServer() as server:
+        apis = {
+            "session": slumber.API(server.url + "api/"),
+            "urllib3": slumber.API(server.url + "api/", transport=Urllib3Transport()),
+        }
+        data = {"name": "object", "tags": ["a", "b"]}
+        calls = {
+            "get.1": lambda api: api.thing.get(size=1),
+            "post": lambda api: api.thing.post(data),
+        }
+        for name in sorted(calls):
+            timings = dict((kind, cpu_per_call(lambda: calls[name](api), count)) for kind, api in apis.items())
+            results.append({
+                "name": "transport.%s" % name,
+                "session_cpu_seconds": timings["session"],
+                "urllib3_cpu_seconds": timings["urllib3"],
+                "saved_cpu_seconds": timings["session"] - timings["urllib3"],
+                "ratio": timings["urllib3"] / timings["session"],
+            })
+        apis["urllib3"]._store["transport"].close()
+    return results
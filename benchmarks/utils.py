@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import division, unicode_literals
+
+import timeit
+
+
+def measure(func, min_time=0.2, repeat=3):
+    """
+    Returns the best time per call of ``func``, in seconds, calling it enough
+    times for each of the ``repeat`` runs to last at least ``min_time``.
+    """
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    return min([elapsed] + timeit.repeat(func, number=number, repeat=repeat - 1)) / number
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """
+    Returns the given percentiles of ``samples`` (nearest rank).
+    """
+    samples = sorted(samples)
+    result = {}
+    for point in points:
+        index = max(0, int(round(point / 100 * len(samples))) - 1)
+        result["p%d" % point] = samples[index]
+    return result
+
+
+def compare(name, slumber, requests):
+    """
+    Builds a result comparing a slumber timing against raw requests.
+    """
+    return {
+        "name": name,
+        "slumber_seconds": slumber,
+        "requests_seconds": requests,
+        "overhead_seconds": slumber - requests,
+        "ratio": slumber / requests if requests else None,
+    }
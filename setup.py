@@ -8,6 +8,11 @@ if sys.version_info[0] >= 3:
     print('Converting code to Python 3 helped by 2to3')
     kwargs['use_2to3'] = True
 
+tests_require = ["mock"]
+if sys.version_info >= (3, 5):
+    # For slumber.aio.
+    tests_require.append("aiohttp")
+
 base_dir = os.path.dirname(os.path.abspath(__file__))
 
 setup(
@@ -24,7 +29,7 @@ setup(
     packages=["slumber"],
     zip_safe=False,
     install_requires=["requests"],
-    tests_require=["mock"],
+    tests_require=tests_require,
     test_suite="tests.get_tests",
     **kwargs
 )
@@ -2,40 +2,235 @@
 
 from __future__ import absolute_import, unicode_literals
 
-import posixpath, urlparse, requests
+import functools, hashlib, json, os, posixpath, urlparse, requests
+from timeit import default_timer as _timer
 
+# Features are imported the first time they are used, to keep import slumber fast.
 from . import exceptions
 from .serialize import Serializer
 
 __all__ = ["Resource", "API"]
 
 
+_SPLIT_CACHE = {}
+_SPLIT_CACHE_SIZE = 1024
+_CHILDREN_CACHE_SIZE = 256
+# Whether resources of a class can be created without calling __init__, by
+# (class creating them, class created).
+_FAST_RESOURCE_CLASSES = {}
+# Settings wrapping requests in a layer of Resource._send.
+_LAYERS = ("rate_limit", "hedge", "balancer", "retry", "circuit_breaker")
+# Methods whose successful responses are deserialized by Resource.
+_DESERIALIZED_METHODS = frozenset(["GET", "POST", "PUT", "PATCH"])
+
+
+def _split_url(url):
+    split = _SPLIT_CACHE.get(url)
+    if split is None:
+        if len(_SPLIT_CACHE) >= _SPLIT_CACHE_SIZE:
+            _SPLIT_CACHE.clear()
+        split = _SPLIT_CACHE[url] = urlparse.urlsplit(url)
+    return split
+
+
+def _is_stream(data):
+    """
+    File-like objects and iterators are streamed, and can only be read once.
+    """
+    if hasattr(data, "read"):
+        return True
+    try:
+        return iter(data) is data
+    except TypeError:
+        return False
+
+
+def _get_function(method):
+    return getattr(method, "__func__", method)
+
+
+def _get_and_call(resource, func, kwargs, id):
+    return func(resource(id).get(**kwargs))
+
+
 def url_join(base, *args):
     """
     Helper function to join an arbitrary number of URL segments together.
     """
-    scheme, netloc, path, query, fragment = urlparse.urlsplit(base)
+    scheme, netloc, path, query, fragment = _split_url(base)
     path = path if len(path) else "/"
     path = posixpath.join(path, *[('%s' % x) for x in args])
     return urlparse.urlunsplit([scheme, netloc, path, query, fragment])
 
 
+class ResourceStore(object):
+    """
+    The settings of a resource. Everything but the URL and a few overrides
+    (such as format) is shared by all the resources of an API, so navigating
+    doesn't copy it. Writes are local to the resource and inherited by the
+    children created afterwards.
+
+    ``template`` is the URL with ids replaced by "{id}", used to group the
+    requests made to the same endpoint.
+
+    The stores of attribute children are memoized in ``children``. Stores
+    pickle their settings, which must be picklable, but not their children.
+
+    ``resolve`` returns the settings as a plain dict, merged once, which
+    requests read instead of going through ``__getitem__`` for every one.
+    """
+
+    __slots__ = ("shared", "base_url", "template", "local", "children", "settings", "layered")
+
+    def __init__(self, shared, base_url=None, local=None, template=None):
+        self.shared = shared
+        self.base_url = shared.get("base_url") if base_url is None else base_url
+        self.template = self.base_url if template is None else template
+        # Shared with the parent until written to.
+        self.local = local
+        self.children = {}
+        self.settings = self.layered = None
+
+    def __getstate__(self):
+        return self.shared, self.base_url, self.template, self.local
+
+    def __setstate__(self, state):
+        self.shared, self.base_url, self.template, self.local = state
+        self.children = {}
+        self.settings = self.layered = None
+
+    def resolve(self):
+        """
+        Returns the settings, but base_url, as a dict not to be written to.
+        ``layered`` tells whether requests go through any of the optional
+        layers (rate limiter, hedging, balancer, retries, circuit breaker).
+        """
+        settings = self.settings
+        if settings is None:
+            if self.local:
+                settings = dict(self.shared)
+                settings.update(self.local)
+            else:
+                settings = self.shared
+            self.layered = any(settings.get(key) is not None for key in _LAYERS)
+            self.settings = settings
+        return settings
+
+    def __getitem__(self, key):
+        if key == "base_url":
+            return self.base_url
+        return self.resolve()[key]
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __contains__(self, key):
+        return key == "base_url" or key in self.shared or (self.local is not None and key in self.local)
+
+    def get(self, key, default=None):
+        if key == "base_url":
+            return self.base_url
+        return self.resolve().get(key, default)
+
+    def update(self, *args, **kwargs):
+        local = dict(self.local or {})
+        local.update(*args, **kwargs)
+        if "base_url" in local:
+            self.base_url = self.template = local.pop("base_url")
+        self.local = local
+        self.settings = self.layered = None
+        # Children memoized so far inherited the old values.
+        self.children = {}
+
+    def copy(self):
+        settings = dict(self.shared)
+        settings.update(self.local or {})
+        settings["base_url"] = self.base_url
+        return settings
+
+    def get_session(self):
+        """
+        Returns the session, with new connection pools in a forked process.
+        """
+        pid = self.shared.get("session_pid")
+        if pid is not None and pid != os.getpid():
+            # Sharing the sockets of the parent would mix up responses.
+            from . import connection
+            connection.reset_pools(self.shared["session"])
+            self.shared["session_pid"] = os.getpid()
+        return self.resolve()["session"]
+
+    def child(self, base_url, template=None, **overrides):
+        local = self.local
+        if overrides:
+            local = dict(local or {})
+            local.update(overrides)
+        return ResourceStore(self.shared, base_url, local, template)
+
+
 class ResourceAttributesMixin(object):
     """
     A mixin that makes it so that accessing an undefined attribute on a class
     results in returning a Resource instance. This instance can then be used
     to make calls to the a Resource.
+
+    The settings of attribute children are memoized, so walking the same path
+    again is a dict lookup. Every access still returns a new resource: the
+    last response is stored on it, and must not be kept alive or shared
+    between threads.
     """
 
+    __slots__ = ()
+
     def __getattr__(self, item):
         if item.startswith("_"):
             raise AttributeError(item)
-        kwargs = self._store.copy()
-        kwargs["base_url"] = url_join(self._store["base_url"], item)
-        return self._get_resource(**kwargs)
+        return self._get_child(item)
+
+    def _get_child(self, segment, is_id=False):
+        segment = "%s" % segment
+        store = self._store
+        if is_id:
+            # Ids are not memoized: loops over many ids would only churn the
+            # memoized stores.
+            return self._get_resource_from_store(
+                store.child(url_join(store.base_url, segment), url_join(store.template, "{id}")))
+        child = store.children.get(segment)
+        if child is None:
+            if len(store.children) >= _CHILDREN_CACHE_SIZE:
+                store.children.clear()
+            child = store.children[segment] = store.child(url_join(store.base_url, segment),
+                                                          url_join(store.template, segment))
+        return self._get_resource_from_store(child)
+
+    def _get_resource_class(self):
+        return self.__class__
+
+    def _get_resource_from_store(self, store):
+        cls = self._get_resource_class()
+        fast = _FAST_RESOURCE_CLASSES.get((type(self), cls))
+        if fast is None:
+            # Subclasses overriding __init__ or _get_resource are created
+            # through them, as they always were.
+            fast = _FAST_RESOURCE_CLASSES[(type(self), cls)] = \
+                _get_function(cls.__init__) is _get_function(Resource.__init__) and \
+                _get_function(type(self)._get_resource) is _get_function(ResourceAttributesMixin._get_resource)
+        if fast:
+            resource = cls.__new__(cls)
+        else:
+            resource = self._get_resource(**store.copy())
+        resource._store = store
+        return resource
 
     def _get_resource(self, **kwargs):
-        return self.__class__(**kwargs)
+        return self._get_resource_class()(**kwargs)
+
+    def __getstate__(self):
+        # Only the settings are pickled, not the last response.
+        return self._store
+
+    def __setstate__(self, store):
+        self._store = store
 
 
 class Resource(ResourceAttributesMixin, object):
@@ -46,8 +241,10 @@ class Resource(ResourceAttributesMixin, object):
     resource which may or may not have children.
     """
 
+    __slots__ = ("_store", "_")
+
     def __init__(self, **kwargs):
-        self._store = kwargs
+        self._store = ResourceStore(kwargs)
 
     def __call__(self, id=None, format=None, url_override=None):
         """
@@ -61,76 +258,405 @@ class Resource(ResourceAttributesMixin, object):
         if id is None and format is None and url_override is None:
             return self
 
-        kwargs = self._store.copy()
+        if format is None and url_override is None:
+            return self._get_child(id, is_id=True)
+
+        base_url, template = self._store.base_url, self._store.template
+        overrides = {}
 
         if id is not None:
-            kwargs["base_url"] = url_join(self._store["base_url"], id)
+            base_url = url_join(base_url, id)
+            template = url_join(template, "{id}")
 
         if format is not None:
-            kwargs["format"] = format
+            overrides["format"] = format
 
         if url_override is not None:
             # @@@ This is hacky and we should probably figure out a better way
             #    of handling the case when a POST/PUT doesn't return an object
             #    but a Location to an object that we need to GET.
-            kwargs["base_url"] = url_override
+            base_url = template = url_override
 
-        return self._get_resource(**kwargs)
+        return self._get_resource_from_store(self._store.child(base_url, template, **overrides))
 
-    def _request(self, method, data=None, files=None, params=None):
-        s = self._store["serializer"]
-        url = self._store["base_url"]
+    def _prepare_request(self, data=None, files=None):
+        """
+        Returns the url, headers and serialized body for a request. Shared by
+        every transport so they all speak the same dialect.
+        """
+        settings = self._store.resolve()
+        s = settings["serializer"]
+        url = self._store.base_url
 
-        if self._store["append_slash"] and not url.endswith("/"):
+        if settings["append_slash"] and not url.endswith("/"):
             url = url + "/"
 
-        headers = {"accept": s.get_content_type()}
+        content_type = s.get_content_type()
+        headers = {"accept": content_type}
 
-        if self._store.get("token", None):
-            headers["Authorization"] = "{token_type} {access_token}".format(**self._store["token"])
+        token = settings.get("token")
+        if token:
+            if hasattr(token, "get_header"):
+                headers["Authorization"] = token.get_header()
+            else:
+                headers["Authorization"] = "{token_type} {access_token}".format(**token)
+
+        compressor = settings.get("compress_requests")
+        if compressor is not None:
+            from .compression import get_accept_encoding
+            headers["accept-encoding"] = get_accept_encoding()
 
         if not files:
-            headers["content-type"] = s.get_content_type()
-            if data is not None:
+            headers["content-type"] = content_type
+            if data is None or hasattr(data, "read"):
+                # File-like objects are sent as they are.
+                pass
+            elif _is_stream(data):
+                data = s.dump_iter(data)
+                if compressor is not None:
+                    data = compressor.compress_iter(data)
+                    headers["content-encoding"] = compressor.encoding
+            else:
                 data = s.dumps(data)
+                if compressor is not None:
+                    data, encoding = compressor.compress(data)
+                    if encoding is not None:
+                        headers["content-encoding"] = encoding
 
-        response = self._store["session"].request(method, url, data=data, params=params, files=files, headers=headers)
+        return url, headers, data
 
+    def _check_response(self, response):
         if 400 <= response.status_code <= 499:
             raise exceptions.HttpClientError(response)
         elif 500 <= response.status_code <= 599:
             raise exceptions.HttpServerError(response)
 
+    def _send(self, method, url, data, files, params, headers, event=None, **kwargs):
+        """
+        Sends the request, retrying it if a retry policy is set and hedging
+        GETs if a hedge policy is.
+        """
+        settings = self._store.resolve()
+        transport = settings.get("transport") or self._store.get_session()
+        limiter = settings.get("rate_limit")
+        hedge = settings.get("hedge") if method == "GET" and not kwargs.get("stream") else None
+        balancer = settings.get("balancer")
+        policy, breaker = settings.get("retry"), settings.get("circuit_breaker")
+
+        # A streamed body can't be sent again.
+        stream = _is_stream(data)
+        if stream:
+            policy = None
+
+        # With several origins, circuits are kept for the origin picked
+        # rather than for the base URL.
+        origin_breaker = breaker if balancer is not None else None
+        if origin_breaker is not None:
+            breaker = None
+
+        def send_to(url):
+            return transport.request(method, url, data=data, params=params, files=files, headers=headers, **kwargs)
+
+        def send_to_origin(url):
+            if origin_breaker is not None:
+                from . import retry
+                return retry.guard(lambda: send_to(url), urlparse.urlsplit(url).netloc, origin_breaker)
+            return send_to(url)
+
+        def send():
+            if balancer is not None:
+                return balancer.send(send_to_origin, url)
+            return send_to(url)
+
+        def attempt():
+            if limiter is not None:
+                return limiter.send(send, url, requeue=not stream)
+            return send()
+
+        def request():
+            if event is not None:
+                event.attempts += 1
+            if hedge is not None:
+                return hedge.send(attempt, self._store.template)
+            return attempt()
+
+        if policy is None and breaker is None:
+            return request()
+        from . import retry
+        # Requeued by the rate limiter rather than retried as well.
+        handled = (429,) if limiter is not None and not stream else ()
+        return retry.send(request, method, url, policy=policy, breaker=breaker, handled=handled)
+
+    def _handle_response(self, method, response):
+        if method != "GET":
+            self._invalidate_cache()
+
+        self._check_response(response)
+
         self._ = response
         return response
 
+    def _request(self, method, data=None, files=None, params=None, headers=None, **kwargs):
+        store = self._store
+        settings = store.resolve()
+        listeners = settings.get("listeners")
+        if listeners:
+            return self._instrumented_request(listeners, method, data, files, params, headers, **kwargs)
+
+        url, request_headers, data = self._prepare_request(data=data, files=files)
+        if headers:
+            request_headers.update(headers)
+
+        if store.layered:
+            response = self._send(method, url, data, files, params, request_headers, **kwargs)
+        else:
+            # Nothing to wrap the request in.
+            transport = settings.get("transport") or store.get_session()
+            response = transport.request(method, url, data=data, params=params, files=files, headers=request_headers,
+                                         **kwargs)
+        return self._handle_response(method, response)
+
+    def _instrumented_request(self, listeners, method, data, files, params, headers, **kwargs):
+        from . import connection, instrumentation
+        event = instrumentation.RequestEvent(method, self._store.base_url, self._store.template)
+
+        started = _timer()
+        url, request_headers, data = self._prepare_request(data=data, files=files)
+        request_headers.update(headers or {})
+        event.serialize_time = _timer() - started
+        event.url = url
+        event.bytes_sent = instrumentation.get_size(data)
+
+        transport = self._store.get("transport") or self._store.get_session()
+        connections = connection.count_connections(transport, url)
+        started = _timer()
+        try:
+            response = self._send(method, url, data, files, params, request_headers, event=event, **kwargs)
+        except Exception as e:
+            event.request_time = _timer() - started
+            event.error = e
+            instrumentation.emit(listeners, event)
+            raise
+        event.request_time = _timer() - started
+        instrumentation.record_response(event, response, stream=kwargs.get("stream", False))
+        if connections is not None:
+            event.connection_reused = connection.count_connections(transport, url) == connections
+
+        try:
+            self._handle_response(method, response)
+        except exceptions.SlumberHttpBaseException as e:
+            event.error = e
+            instrumentation.emit(listeners, event)
+            raise
+
+        if method in _DESERIALIZED_METHODS and 200 <= response.status_code <= 299 and not kwargs.get("stream"):
+            # Sent once the body is deserialized, so that it can be timed.
+            response._slumber_event = event
+        else:
+            instrumentation.emit(listeners, event)
+        return response
+
     def _handle_redirect(self, response, **kwargs):
         # @@@ Hacky, see description in __call__
         resource_obj = self(url_override=response.headers["location"])
         return resource_obj.get(params=kwargs)
 
-    def _try_to_serialize_response(self, response):
-        s = self._store["serializer"]
-
-        if response.headers.get("content-type", None):
-            content_type = response.headers.get("content-type").split(";")[0].strip()
+    def _deserialize_response(self, response):
+        event = getattr(response, "_slumber_event", None)
+        if event is not None:
+            response._slumber_event = None
+            started = _timer()
+            try:
+                return self._deserialize_response_content(response)
+            except Exception as e:
+                event.error = e
+                raise
+            finally:
+                # Also sent when the body can't be deserialized.
+                event.deserialize_time = _timer() - started
+                from . import instrumentation
+                instrumentation.emit(self._store["listeners"], event)
+        return self._deserialize_content(response.headers.get("content-type"), response.content)
+
+    def _deserialize_response_content(self, response):
+        return self._deserialize_content(response.headers.get("content-type", None), response.content)
+
+    def _deserialize_content(self, content_type, content):
+        s = self._store.resolve()["serializer"]
+
+        if content_type:
+            content_type = content_type.split(";")[0].strip()
             try:
                 stype = s.get_serializer(content_type=content_type)
-                response_content = stype.loads(response.content)
+                content = stype.loads(content)
             except exceptions.SerializerNotAvailable:
-                response_content = response.content
-        else:
-            response_content = response.content
-        hook = self._store.get("response_hook")
+                pass
+        return content
+
+    def _apply_response_hook(self, response_content):
+        hook = self._store.resolve().get("response_hook")
         return hook(self, response_content) if hook else response_content
 
+    def _try_to_serialize_response(self, response):
+        return self._apply_response_hook(self._deserialize_response(response))
+
+    def _invalidate_cache(self):
+        cache = self._store.resolve().get("cache")
+        if cache is not None:
+            cache.invalidate(self._store["base_url"])
+
+    def _get_token_identity(self):
+        token = self._store.get("token")
+        if not token:
+            return None
+        # Token providers identify the credentials across refreshes.
+        return token.identity if hasattr(token, "get_header") else token.get("access_token")
+
+    def _get_auth_scope(self):
+        """
+        Identifies the credentials requests are made with, the same way in
+        every process, so that cached responses only go to the same ones: the
+        token, and the auth, headers and cookies of the session. Returns
+        False when the auth can't be identified, such requests aren't cached.
+        """
+        session = self._store["session"]
+        auth = getattr(session, "auth", None)
+        if auth is not None and not isinstance(auth, tuple):
+            # Auth objects, like HTTPBasicAuth, are told apart by their state,
+            # functions and objects without any can't be.
+            if not getattr(auth, "__dict__", None):
+                return False
+            auth = [type(auth).__name__, auth.__dict__]
+        cookies = getattr(session, "cookies", None)
+        credentials = [
+            self._get_token_identity(),
+            auth,
+            sorted(dict(getattr(session, "headers", None) or {}).items()),
+            sorted(requests.utils.dict_from_cookiejar(cookies).items()) if cookies is not None else None,
+        ]
+        if credentials == [None, None, [], None]:
+            return None
+        try:
+            credentials = json.dumps(credentials, sort_keys=True)
+        except (TypeError, ValueError):
+            return False
+        return hashlib.sha1(credentials.encode("utf-8")).hexdigest()
+
+    def _get_entry_content(self, entry):
+        # Entries of persistent caches hold the body rather than objects.
+        if entry.body is not None:
+            return self._deserialize_content(entry.content_type, entry.body)
+        return entry.content
+
+    def _cached_get(self, cache, params):
+        scope = self._get_auth_scope()
+        if scope is False:
+            return self._uncached_get(params)
+        key = cache.get_key(self._store["base_url"], params, scope=scope)
+        entry = cache.get(key)
+
+        if entry is not None and entry.is_fresh():
+            cache.count("hits")
+            return self._apply_response_hook(self._get_entry_content(entry))
+
+        response = self._request("GET", params=params, headers=entry.get_validators() if entry else None)
+
+        if response.status_code == 304 and entry is not None:
+            cache.count("revalidations")
+            cache.refresh(entry, response)
+            return self._apply_response_hook(self._get_entry_content(entry))
+
+        cache.count("misses")
+        if 200 <= response.status_code <= 299:
+            response_content = self._deserialize_response(response)
+            if response.status_code == 200:
+                cache.set(key, response, response_content)
+            return self._apply_response_hook(response_content)
+
+    def _get_flight_key(self, params):
+        # Requests only share results with requests made with the same credentials.
+        from .cache import Cache
+        auth = (id(self._store["session"]), self._get_token_identity())
+        return Cache.get_key(self._store["base_url"], params) + auth
+
     def get(self, **kwargs):
+        settings = self._store.resolve()
+        if settings.get("single_flight") is not None:
+            return settings["single_flight"].do(self._get_flight_key(kwargs), lambda: self._get(kwargs))
+        if settings.get("cache") is not None:
+            return self._cached_get(settings["cache"], kwargs)
+        return self._uncached_get(kwargs)
+
+    def _get(self, kwargs):
+        cache = self._store.resolve().get("cache")
+        if cache is not None:
+            return self._cached_get(cache, kwargs)
+        return self._uncached_get(kwargs)
+
+    def _uncached_get(self, kwargs):
         response = self._request("GET", params=kwargs)
         if 200 <= response.status_code <= 299:
             return self._try_to_serialize_response(response)
         else:
             return  # @@@ We should probably do some sort of error here? (Is this even possible?)
 
+    def iter_items(self, path=None, chunk_size=64 * 1024, **kwargs):
+        """
+        Streams the response of a GET and yields the items of the list found
+        at ``path`` (e.g. "objects") one by one, without loading the whole
+        body in memory when the serializer can decode incrementally. The
+        response_hook is not called.
+        """
+        response = self._request("GET", params=kwargs, stream=True)
+        try:
+            content_type = (response.headers.get("content-type") or "").split(";")[0].strip()
+            s = self._store["serializer"]
+            stype = s.get_serializer(content_type=content_type) if content_type else s.get_serializer()
+            for item in stype.iter_loads(response.iter_content(chunk_size), path=path):
+                yield item
+        finally:
+            response.close()
+
+    def download(self, dest, chunk_size=1024 * 1024, resume=True, connections=1, preallocate=False,
+                 memory_map=False, progress=None, **kwargs):
+        """
+        Streams the body of a GET to ``dest``, a path, a file-like object or
+        a writable buffer such as a bytearray, ``chunk_size`` bytes at a time,
+        without holding it in memory. Returns the size, bytes received, time
+        taken and throughput.
+
+        A partial file at ``dest`` is completed with a Range request when
+        ``resume`` is set. With ``connections`` > 1 and a server accepting
+        ranges, parts of the body are fetched in parallel. The file can be
+        allocated to its full size beforehand with ``preallocate``, and
+        written through a memory map with ``memory_map``; such files can't
+        be resumed. ``progress`` is called with the bytes downloaded so far
+        and the total size.
+        """
+        from . import download
+
+        def fetch(headers):
+            return self._request("GET", params=kwargs, headers=headers, stream=True)
+        return download.download(fetch, dest, chunk_size=chunk_size, resume=resume, connections=connections,
+                                 preallocate=preallocate, memory_map=memory_map, progress=progress)
+
+    def iterate(self, paginator=None, prefetch=1, **kwargs):
+        """
+        Yields the items of every page of the resource, following the
+        pagination with ``paginator`` (a NextUrlPaginator by default).
+
+        The next ``prefetch`` pages are fetched in a background thread while
+        the current one is consumed; 0 fetches them only when needed.
+        """
+        from . import pagination, parallel
+        paginator = paginator or pagination.NextUrlPaginator()
+        pages = pagination.iter_pages(self, paginator, kwargs)
+        if prefetch:
+            pages = parallel.prefetch(pages, depth=prefetch)
+        for page in pages:
+            for item in paginator.get_items(page):
+                yield item
+
     def post(self, data=None, files=None, **kwargs):
         response = self._request("POST", data=data, files=files, params=kwargs)
         if 200 <= response.status_code <= 299:
@@ -164,33 +690,164 @@ class Resource(ResourceAttributesMixin, object):
         else:
             return False
 
+    def get_many(self, ids, max_workers=10, **kwargs):
+        """
+        Fetches ``api.resource(id).get(**kwargs)`` for every id concurrently
+        and returns the results in the same order. Failed items come back as
+        HttpClientError or HttpServerError instances.
+
+        All the workers share the session, so ``max_workers`` should not be
+        higher than its connection pool size.
+        """
+        from . import parallel
+        return parallel.thread_map(lambda id: self(id).get(**kwargs), ids, max_workers=max_workers)
+
+    def delete_many(self, ids, max_workers=10, **kwargs):
+        """
+        Deletes ``api.resource(id)`` for every id concurrently, see get_many.
+        """
+        from . import parallel
+        return parallel.thread_map(lambda id: self(id).delete(**kwargs), ids, max_workers=max_workers)
+
+    def map_process(self, func, ids, processes=None, **kwargs):
+        """
+        Fetches ``api.resource(id).get(**kwargs)`` for every id and calls
+        ``func`` on the result in a pool of ``processes`` processes, one per
+        CPU by default, for CPU bound post-processing. Returns the results in
+        the order of the ids, with HTTP errors in place of failed items.
+
+        The resource is sent to every process, so its settings and ``func``
+        must be picklable, e.g. a module level function.
+        """
+        from . import parallel
+        return parallel.process_map(functools.partial(_get_and_call, self, func, kwargs), ids, processes=processes)
+
+    def bulk_create(self, records, chunk_size=100, concurrency=4, key=None, max_pending=None, **kwargs):
+        """
+        POSTs ``records`` to the resource as lists of ``chunk_size`` records,
+        wrapped in ``{key: [...]}`` when ``key`` is given, sending
+        ``concurrency`` chunks at a time. ``records`` can be a generator, it
+        is read only as chunks are sent.
+
+        Returns a slumber.bulk.BulkReport with the outcome of every chunk.
+        """
+        from . import bulk
+
+        def send(chunk):
+            return self.post({key: chunk} if key else chunk, **kwargs)
+        return bulk.send_chunks(send, records, chunk_size, concurrency, max_pending)
+
+    def bulk_update(self, records, chunk_size=100, concurrency=4, key="objects", max_pending=None, **kwargs):
+        """
+        Same as bulk_create, but PATCHes the chunks, as ``{"objects": [...]}``
+        by default like Tastypie expects. Use ``key=None`` to send bare lists.
+        """
+        from . import bulk
+
+        def send(chunk):
+            return self.patch({key: chunk} if key else chunk, **kwargs)
+        return bulk.send_chunks(send, records, chunk_size, concurrency, max_pending)
+
 
 class API(ResourceAttributesMixin, object):
 
     resource_class = Resource
 
     def __init__(self, base_url=None, auth=None, format=None, append_slash=True, session=None, serializer=None,
-                 token=None, response_hook=None):
+                 token=None, response_hook=None, cache=None, pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keepalive=True, retry=None, circuit_breaker=None, listeners=None, single_flight=False,
+                 compress_requests=None, rate_limit=None, transport=None, hedge=None, base_urls=None):
         if serializer is None:
             serializer = Serializer(default=format)
 
         if session is None:
             session = requests.session()
             session.auth = auth
-
-        self._store = {
+            from . import connection
+            connection.mount_adapters(session, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                      pool_block=pool_block, keepalive=keepalive)
+
+        if cache is True:
+            from .cache import Cache
+            cache = Cache()
+        elif isinstance(cache, basestring):
+            from .cache import DiskCache
+            cache = DiskCache(cache)
+
+        if single_flight is True:
+            from .singleflight import SingleFlight
+            single_flight = SingleFlight()
+
+        if compress_requests is True:
+            from .compression import RequestCompressor
+            compress_requests = RequestCompressor()
+        elif isinstance(compress_requests, basestring):
+            from .compression import RequestCompressor
+            compress_requests = RequestCompressor(encoding=compress_requests)
+
+        if isinstance(rate_limit, bool):
+            raise exceptions.ImproperlyConfigured("rate_limit is a number of requests per second or a RateLimiter")
+        elif isinstance(rate_limit, (int, float)):
+            from .ratelimit import RateLimiter
+            rate_limit = RateLimiter(rate=rate_limit)
+
+        if hedge is True:
+            from .hedging import HedgePolicy
+            hedge = HedgePolicy()
+        elif isinstance(hedge, (int, float)) and not isinstance(hedge, bool):
+            from .hedging import HedgePolicy
+            hedge = HedgePolicy(delay=hedge)
+
+        if isinstance(base_urls, (list, tuple)):
+            from .balancer import LoadBalancer
+            base_urls = LoadBalancer(base_urls)
+        if base_urls is not None:
+            if base_url is not None:
+                raise exceptions.ImproperlyConfigured("base_url and base_urls can't be both given")
+            base_url = base_urls.base_url
+
+        if hasattr(transport, "bind"):
+            transport.bind(session)
+
+        self._store = ResourceStore({
             "base_url": base_url,
             "format": "json" if format is None else format,
             "append_slash": append_slash,
             "session": session,
             "serializer": serializer,
             "token": token,
-            "response_hook": response_hook
-        }
+            "response_hook": response_hook,
+            "cache": cache,
+            "retry": retry,
+            "circuit_breaker": circuit_breaker,
+            "listeners": list(listeners or []),
+            "single_flight": single_flight or None,
+            "compress_requests": compress_requests or None,
+            "rate_limit": rate_limit,
+            "transport": transport,
+            "hedge": hedge or None,
+            "balancer": base_urls,
+            "session_pid": os.getpid(),
+        })
 
         # Do some Checks for Required Values
         if self._store.get("base_url") is None:
             raise exceptions.ImproperlyConfigured("base_url is required")
 
-    def _get_resource(self, **kwargs):
-        return self.resource_class(**kwargs)
+    def _get_resource_class(self):
+        return self.resource_class
+
+    def add_listener(self, listener):
+        """
+        Registers a callable to be called with a RequestEvent after each
+        request made through this API.
+        """
+        self._store.shared["listeners"].append(listener)
+
+    def pool_stats(self):
+        """
+        Returns the open, idle and in use connections and the connection reuse
+        ratio of every host, keyed by "scheme://host:port".
+        """
+        from . import connection
+        return connection.get_pool_stats(self._store.get_session())
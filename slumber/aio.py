@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio flavour of slumber, built on top of aiohttp.
+
+Only available on Python 3.5+ with aiohttp installed::
+
+    api = slumber.aio.AsyncAPI("http://path/to/my/api/")
+    result = await api.resource(1).get()
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+
+from . import API, Resource, exceptions
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+__all__ = ["AsyncResource", "AsyncAPI"]
+
+
+class AsyncResponse(object):
+    """
+    Exposes an aiohttp response (whose body was already read) with the
+    attributes of requests.Response used by slumber and its exceptions.
+    """
+
+    def __init__(self, response, content):
+        self.raw = response
+        self.status_code = response.status
+        self.reason = response.reason
+        self.url = str(response.url)
+        self.headers = response.headers
+        self.encoding = response.charset
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", "replace")
+
+
+class AsyncSession(object):
+    """
+    Lazily creates the pooled aiohttp session the first time a request is
+    made, so that it is bound to the running event loop.
+    """
+
+    def __init__(self, session=None, auth=None, limit=100, limit_per_host=0):
+        if isinstance(auth, tuple):
+            auth = aiohttp.BasicAuth(*auth)
+        self.auth = auth
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = session
+
+    def get(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, auth=self.auth)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+def _not_async(name):
+    def method(self, *args, **kwargs):
+        raise NotImplementedError("%s is not available with AsyncAPI, use slumber.API" % name)
+    method.__name__ = str(name)
+    return method
+
+
+class AsyncResource(Resource):
+    """
+    Same navigation as Resource, but the HTTP methods are coroutines. The
+    helpers built on the blocking methods are not available.
+
+    Requests go straight to the aiohttp session: retries, the cache, rate
+    limiting, single flight, hedging, the balancer, the circuit breaker and
+    the listeners of the API are not applied.
+    """
+
+    __slots__ = ()
+
+    iter_items = _not_async("iter_items")
+    download = _not_async("download")
+    iterate = _not_async("iterate")
+    get_many = _not_async("get_many")
+    delete_many = _not_async("delete_many")
+    map_process = _not_async("map_process")
+    bulk_create = _not_async("bulk_create")
+    bulk_update = _not_async("bulk_update")
+
+    def _get_form(self, data, files):
+        form = aiohttp.FormData()
+        for key, value in (data or {}).items():
+            form.add_field(key, value)
+        for key, fp in files.items():
+            form.add_field(key, fp, filename=getattr(fp, "name", key))
+        return form
+
+    async def _request(self, method, data=None, files=None, params=None):
+        token = self._store.get("token")
+        if hasattr(token, "is_expired") and token.is_expired():
+            # Fetching a token blocks, the event loop goes on meanwhile.
+            await asyncio.get_event_loop().run_in_executor(None, token.get_header)
+
+        url, headers, data = self._prepare_request(data=data, files=files)
+
+        if files:
+            data = self._get_form(data, files)
+
+        if params:
+            # requests silently drops None values, aiohttp refuses them.
+            params = dict((k, v) for k, v in params.items() if v is not None)
+
+        session = self._store["session"].get()
+        async with session.request(method, url, data=data, params=params, headers=headers) as r:
+            response = AsyncResponse(r, await r.read())
+
+        self._check_response(response)
+
+        self._ = response
+        return response
+
+    async def _handle_redirect(self, response, **kwargs):
+        resource_obj = self(url_override=response.headers["location"])
+        return await resource_obj.get(params=kwargs)
+
+    async def get(self, **kwargs):
+        response = await self._request("GET", params=kwargs)
+        if 200 <= response.status_code <= 299:
+            return self._try_to_serialize_response(response)
+
+    async def post(self, data=None, files=None, **kwargs):
+        response = await self._request("POST", data=data, files=files, params=kwargs)
+        if 200 <= response.status_code <= 299:
+            return self._try_to_serialize_response(response)
+
+    async def patch(self, data=None, files=None, **kwargs):
+        response = await self._request("PATCH", data=data, files=files, params=kwargs)
+        if 200 <= response.status_code <= 299:
+            return self._try_to_serialize_response(response)
+
+    async def put(self, data=None, files=None, **kwargs):
+        response = await self._request("PUT", data=data, files=files, params=kwargs)
+        if 200 <= response.status_code <= 299:
+            return self._try_to_serialize_response(response)
+        else:
+            return False
+
+    async def delete(self, **kwargs):
+        response = await self._request("DELETE", params=kwargs)
+        return 200 <= response.status_code <= 299
+
+
+class AsyncAPI(API):
+    """
+    asyncio counterpart of API. ``limit`` and ``limit_per_host`` size the
+    connection pool shared by every resource of this API.
+    """
+
+    resource_class = AsyncResource
+
+    # The requests of AsyncResource don't reach them.
+    add_listener = _not_async("add_listener")
+    pool_stats = _not_async("pool_stats")
+
+    def __init__(self, base_url=None, auth=None, format=None, append_slash=True, session=None, serializer=None,
+                 token=None, response_hook=None, limit=100, limit_per_host=0):
+        if aiohttp is None:
+            raise exceptions.ImproperlyConfigured("aiohttp is required to use AsyncAPI")
+
+        session = AsyncSession(session=session, auth=auth, limit=limit, limit_per_host=limit_per_host)
+
+        super(AsyncAPI, self).__init__(base_url=base_url, auth=auth, format=format, append_slash=append_slash,
+                                       session=session, serializer=serializer, token=token,
+                                       response_hook=response_hook)
+
+    async def close(self):
+        await self._store["session"].close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Token providers can be passed as ``API(token=...)`` in place of a token
+dict. They keep the token fresh and the Authorization header formatted.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import threading, time, uuid
+
+import requests
+
+from . import exceptions
+from .retry import Counters
+from .singleflight import SingleFlight
+
+__all__ = ["TokenProvider", "OAuth2TokenProvider"]
+
+
+class TokenProvider(Counters):
+    """
+    Holds a token and fetches a new one ``refresh_margin`` seconds before it
+    expires, or at half its lifetime for short lived ones. The refresh runs in
+    a background thread while the current token is still valid, so requests,
+    threads and asyncio tasks alike, keep going with it. Once it has expired,
+    callers wait for a single refresh shared by all of them.
+
+    Subclasses implement ``fetch_token``, returning a dict with ``token_type``,
+    ``access_token`` and, if the token expires, ``expires_in`` (seconds) or
+    ``expires_at`` (timestamp). A failed background refresh is tried again
+    after ``retry_interval`` seconds.
+
+    Blocking callers, such as asyncio code, should check ``is_expired()``
+    and call ``get_header`` in a thread when it is true.
+    """
+
+    counters = ("refreshes", "background_refreshes", "failures")
+
+    def __init__(self, token=None, refresh_margin=60, retry_interval=5):
+        super(TokenProvider, self).__init__()
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.token = None
+        # The formatted header, when to refresh it and when it expires.
+        self._state = (None, 0, 0)
+        self._refreshing = False
+        self._flight = SingleFlight()
+        # Pickled along, so copies sent to other processes share it.
+        self._identity = uuid.uuid4().hex
+        if token is not None:
+            self.set_token(token)
+
+    def __getstate__(self):
+        state = super(TokenProvider, self).__getstate__()
+        state["_refreshing"] = False
+        return state
+
+    @property
+    def identity(self):
+        """
+        Identifies the credentials, the same way across refreshes. Each
+        provider has its own, subclasses knowing who the tokens are for can
+        return one shared by the processes using the same credentials.
+        """
+        return self._identity
+
+    def fetch_token(self):
+        raise NotImplementedError()
+
+    def set_token(self, token):
+        now = time.time()
+        if token.get("expires_at") is not None:
+            expires_at = float(token["expires_at"])
+        elif token.get("expires_in") is not None:
+            expires_at = now + float(token["expires_in"])
+        else:
+            expires_at = float("inf")
+        refresh_at = expires_at - min(self.refresh_margin, (expires_at - now) / 2)
+        header = "%s %s" % (token.get("token_type") or "Bearer", token["access_token"])
+        self.token = token
+        self._state = (header, refresh_at, expires_at)
+
+    def is_expired(self):
+        """
+        Tells whether ``get_header`` has to wait for a new token.
+        """
+        return time.time() >= self._state[2]
+
+    def get_header(self):
+        """
+        Returns the Authorization header to send.
+        """
+        header, refresh_at, expires_at = self._state
+        now = time.time()
+        if now < refresh_at:
+            return header
+        if now < expires_at:
+            self._refresh_in_background()
+            return header
+        self._flight.do("token", self.refresh)
+        return self._state[0]
+
+    def refresh(self):
+        try:
+            token = self.fetch_token()
+        except Exception:
+            self.count("failures")
+            raise
+        self.set_token(token)
+        self.count("refreshes")
+
+    def invalidate(self):
+        """
+        Makes the next request wait for a new token, e.g. after the server
+        revoked the current one.
+        """
+        self._state = (self._state[0], 0, 0)
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        thread = threading.Thread(target=self._background_refresh)
+        thread.daemon = True
+        thread.start()
+
+    def _background_refresh(self):
+        try:
+            self._flight.do("token", self.refresh)
+            self.count("background_refreshes")
+        except Exception:
+            header, refresh_at, expires_at = self._state
+            self._state = (header, min(expires_at, time.time() + self.retry_interval), expires_at)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+class OAuth2TokenProvider(TokenProvider):
+    """
+    Gets tokens from the OAuth2 endpoint at ``token_url`` with the client
+    credentials grant, or the refresh token grant when the current token
+    comes with a refresh token. The client authenticates with HTTP basic
+    auth.
+
+    Its identity is made of the endpoint, client, scope and the refresh token
+    it was created with, which tells users apart.
+    """
+
+    def __init__(self, token_url, client_id=None, client_secret=None, scope=None, token=None, timeout=30,
+                 **kwargs):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.timeout = timeout
+        self._refresh_token = (token or {}).get("refresh_token")
+        super(OAuth2TokenProvider, self).__init__(token=token, **kwargs)
+
+    @property
+    def identity(self):
+        if self.client_id is None and self._refresh_token is None:
+            return super(OAuth2TokenProvider, self).identity
+        return "%s %s %s %s" % (self.token_url, self.client_id, self.scope, self._refresh_token)
+
+    def fetch_token(self):
+        refresh_token = (self.token or {}).get("refresh_token")
+        if refresh_token:
+            data = {"grant_type": "refresh_token", "refresh_token": refresh_token}
+        else:
+            data = {"grant_type": "client_credentials"}
+        if self.scope:
+            data["scope"] = self.scope
+
+        auth = (self.client_id, self.client_secret) if self.client_id else None
+        # Not pooled: refreshes are rare and must work from any process.
+        response = requests.post(self.token_url, data=data, auth=auth, timeout=self.timeout)
+        if 400 <= response.status_code <= 499:
+            raise exceptions.HttpClientError(response)
+        elif 500 <= response.status_code <= 599:
+            raise exceptions.HttpServerError(response)
+
+        token = response.json()
+        if refresh_token and not token.get("refresh_token"):
+            token["refresh_token"] = refresh_token
+        return token
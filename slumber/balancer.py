@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Client side load balancing over several origins serving the same API.
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import random, time
+from timeit import default_timer as _timer
+
+import requests
+
+from . import exceptions
+from .retry import Counters
+
+__all__ = ["Origin", "RoundRobin", "LeastOutstanding", "Ewma", "LoadBalancer"]
+
+
+class Origin(object):
+    """
+    The state of an origin: requests in flight, latency and health.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.latency = None
+        self.failures = 0
+        self.ejected_until = None
+        self.probing = False
+
+    def is_available(self, now):
+        if self.ejected_until is None:
+            return True
+        # Past its ejection, an origin gets a single trial request.
+        return now >= self.ejected_until and not self.probing
+
+
+class RoundRobin(object):
+    """
+    Picks the origins in turn.
+    """
+
+    def __init__(self):
+        self._next = 0
+
+    def choose(self, origins):
+        self._next += 1
+        return origins[(self._next - 1) % len(origins)]
+
+
+class LeastOutstanding(object):
+    """
+    Picks the origin with the fewest requests in flight, at random among
+    equals.
+    """
+
+    def choose(self, origins):
+        fewest = min(origin.outstanding for origin in origins)
+        return random.choice([origin for origin in origins if origin.outstanding == fewest])
+
+
+class Ewma(object):
+    """
+    Picks the origin with the lowest moving average of its latency, weighted
+    by the requests in flight, so a fast origin isn't sent everything.
+    Origins with no latency measured yet go first.
+    """
+
+    def choose(self, origins):
+        return min(origins, key=lambda origin: (origin.latency or 0) * (origin.outstanding + 1))
+
+
+STRATEGIES = {
+    "round_robin": RoundRobin,
+    "least_outstanding": LeastOutstanding,
+    "ewma": Ewma,
+}
+
+
+class LoadBalancer(Counters):
+    """
+    Sends every request to one of ``origins``, base URLs serving the same
+    API, picked by ``strategy``: "round_robin", "least_outstanding", "ewma"
+    or an object with a ``choose(origins)`` method.
+
+    An origin failing ``max_failures`` times in a row, with a 5xx response or
+    a connection error, is ejected for ``ejection_time`` seconds. Then a
+    single request probes it: it is back in if that request succeeds and
+    ejected again otherwise. When every origin is ejected, the one due back
+    first is used.
+
+    ``decay`` is the weight of the last request in the latency averages.
+    """
+
+    counters = ("requests", "failures", "ejections", "probes")
+
+    def __init__(self, origins, strategy="round_robin", max_failures=3, ejection_time=30, decay=0.3):
+        super(LoadBalancer, self).__init__()
+        if not origins:
+            raise exceptions.ImproperlyConfigured("LoadBalancer needs at least one origin")
+        if strategy in STRATEGIES:
+            strategy = STRATEGIES[strategy]()
+        elif not hasattr(strategy, "choose"):
+            raise exceptions.ImproperlyConfigured("%s is not a load balancing strategy" % strategy)
+        self.origins = [Origin(url) for url in origins]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.decay = decay
+
+    @property
+    def base_url(self):
+        """
+        The URL resources are built from, requests are then sent to the same
+        path on the origin picked.
+        """
+        return self.origins[0].url
+
+    def acquire(self):
+        with self._lock:
+            now = time.time()
+            available = [origin for origin in self.origins if origin.is_available(now)]
+            if available:
+                origin = self.strategy.choose(available)
+            else:
+                origin = min(self.origins, key=lambda origin: origin.ejected_until)
+            if origin.ejected_until is not None:
+                origin.probing = True
+                self.probes += 1
+            origin.outstanding += 1
+            origin.requests += 1
+            self.requests += 1
+            return origin
+
+    def release(self, origin, elapsed, failed):
+        with self._lock:
+            origin.outstanding -= 1
+            origin.latency = elapsed if origin.latency is None else \
+                self.decay * elapsed + (1 - self.decay) * origin.latency
+            if not failed:
+                origin.failures, origin.ejected_until, origin.probing = 0, None, False
+                return
+            self.failures += 1
+            origin.failures += 1
+            if origin.probing or origin.failures >= self.max_failures:
+                if not origin.probing:
+                    self.ejections += 1
+                origin.ejected_until = time.time() + self.ejection_time
+                origin.probing = False
+
+    def send(self, request, url):
+        """
+        Calls ``request`` with ``url`` moved to the origin picked, unless it
+        isn't under the base URL.
+        """
+        base_url = self.base_url
+        if not url.startswith(base_url):
+            return request(url)
+
+        origin = self.acquire()
+        started, failed = _timer(), True
+        try:
+            response = request(origin.url + url[len(base_url):])
+            failed = response.status_code >= 500
+            return response
+        except Exception as e:
+            # Other errors are not the fault of the origin.
+            failed = isinstance(e, (requests.ConnectionError, requests.Timeout, exceptions.CircuitOpenError))
+            raise
+        finally:
+            self.release(origin, _timer() - started, failed)
+
+    def stats(self):
+        stats = super(LoadBalancer, self).stats()
+        now = time.time()
+        with self._lock:
+            stats["origins"] = dict((origin.url, {
+                "requests": origin.requests,
+                "outstanding": origin.outstanding,
+                "latency": origin.latency,
+                "available": origin.is_available(now),
+            }) for origin in self.origins)
+        return stats
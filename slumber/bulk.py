@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import itertools
+
+import requests
+
+from . import exceptions, parallel
+
+__all__ = ["ChunkResult", "BulkReport", "chunked", "send_chunks"]
+
+
+class ChunkResult(object):
+    """
+    The outcome of sending one chunk: the deserialized response, or the
+    HttpClientError, HttpServerError or connection error it failed with.
+    """
+
+    __slots__ = ("index", "size", "result", "error")
+
+    def __init__(self, index, size, result=None, error=None):
+        self.index = index
+        self.size = size
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "<ChunkResult %d: %d records, %s>" % (self.index, self.size, "ok" if self.ok else repr(self.error))
+
+
+class BulkReport(list):
+    """
+    The ChunkResult of every chunk, in the order of the records.
+    """
+
+    @property
+    def succeeded(self):
+        return sum(chunk.size for chunk in self if chunk.ok)
+
+    @property
+    def failed(self):
+        return sum(chunk.size for chunk in self if not chunk.ok)
+
+    @property
+    def errors(self):
+        return [chunk for chunk in self if not chunk.ok]
+
+
+def chunked(iterable, size):
+    """
+    Yields lists of ``size`` items of ``iterable``, the last one possibly
+    shorter, consuming it lazily.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def send_chunks(send, records, chunk_size=100, concurrency=4, max_pending=None):
+    """
+    Calls ``send`` with the chunks of ``records`` from ``concurrency``
+    threads and returns a BulkReport. Records are read only as chunks are
+    sent, at most ``max_pending`` chunks ahead.
+    """
+    def run(job):
+        index, chunk = job
+        try:
+            return ChunkResult(index, len(chunk), result=send(chunk))
+        except (exceptions.SlumberHttpBaseException, requests.RequestException) as e:
+            return ChunkResult(index, len(chunk), error=e)
+
+    jobs = enumerate(chunked(records, chunk_size))
+    return BulkReport(parallel.bounded_map(run, jobs, max_workers=concurrency, max_pending=max_pending))
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import contextlib, json, os, re, threading, time
+from collections import OrderedDict
+from email.utils import mktime_tz, parsedate_tz
+
+from . import exceptions
+
+# Imported by the first DiskCache created.
+sqlite3 = None
+
+__all__ = ["Cache", "CacheEntry", "DiskCache"]
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+def _parse_http_date(value):
+    parsed = parsedate_tz(value) if value else None
+    return mktime_tz(parsed) if parsed else None
+
+
+class CacheEntry(object):
+    """
+    A deserialized GET result along with what is needed to revalidate it.
+    Entries of a DiskCache hold the raw ``body`` and its ``content_type``
+    instead.
+    """
+
+    def __init__(self, url, content, size, etag=None, last_modified=None, expires=0, body=None, content_type=None,
+                 key=None):
+        self.url = url
+        self.content = content
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.body = body
+        self.content_type = content_type
+        self.key = key
+
+    def is_fresh(self):
+        return time.time() < self.expires
+
+    def get_validators(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class Cache(object):
+    """
+    In memory LRU cache of deserialized GET results, keyed by URL and query
+    parameters.
+
+    Entries are evicted, least recently used first, as soon as there are more
+    than ``max_entries`` of them or their bodies weight more than ``max_size``
+    bytes. Cached objects are shared between callers and should be treated as
+    read-only.
+    """
+
+    def __init__(self, max_entries=1024, max_size=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.hits = self.misses = self.revalidations = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Pickled empty, entries are kept in the memory of each process.
+        return {"max_entries": self.max_entries, "max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def get_key(url, params=None, scope=None):
+        """
+        ``scope`` identifies the credentials of the request, responses are
+        only shared between requests made with the same ones.
+        """
+        items = (params or {}).items()
+        return (url, tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in items)), scope)
+
+    def count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def get_freshness(self, headers, now=None):
+        """
+        Returns the expiry timestamp of a response, or None if it must not
+        be stored at all.
+        """
+        now = time.time() if now is None else now
+        cache_control = (headers.get("cache-control") or "").lower()
+
+        if "no-store" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return now
+
+        max_age = _MAX_AGE_RE.search(cache_control)
+        if max_age:
+            return now + int(max_age.group(1))
+
+        # Invalid dates, like "0", mean already expired.
+        expires = _parse_http_date(headers.get("expires"))
+        return expires if expires is not None else now
+
+    def get_validity(self, response):
+        """
+        Returns the expiry timestamp, ETag and Last-Modified of a response,
+        or None if it is neither fresh nor revalidable, so keeping it would
+        only waste room.
+        """
+        headers = response.headers
+        expires = self.get_freshness(headers)
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+
+        if expires is None or (expires <= time.time() and not (etag or last_modified)):
+            return None
+        return expires, etag, last_modified
+
+    def set(self, key, response, content):
+        validity = self.get_validity(response)
+
+        with self._lock:
+            # A response that can't be stored replaces the stale entry too.
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            if validity is None:
+                return None
+            expires, etag, last_modified = validity
+            entry = CacheEntry(key[0], content, len(response.content or b""), etag=etag,
+                               last_modified=last_modified, expires=expires)
+            if entry.size > self.max_size:
+                return None
+            self._entries[key] = entry
+            self.size += entry.size
+            self._evict()
+        return entry
+
+    def refresh(self, entry, response):
+        """
+        Extends the lifetime of an entry after a 304 Not Modified.
+        """
+        expires = self.get_freshness(response.headers)
+        entry.expires = expires if expires is not None else 0
+        entry.etag = response.headers.get("etag") or entry.etag
+        entry.last_modified = response.headers.get("last-modified") or entry.last_modified
+        return entry
+
+    def invalidate(self, url):
+        """
+        Drops every entry cached for the given URL, whatever its parameters.
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == url]:
+                self.size -= self._entries.pop(key).size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "entries": len(self._entries),
+            "size": self.size,
+        }
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_size):
+            key, entry = self._entries.popitem(last=False)
+            self.size -= entry.size
+
+
+class DiskCache(Cache):
+    """
+    Persistent LRU cache of GET responses in the SQLite database at ``path``,
+    which any number of threads and processes can share.
+
+    The raw bodies are stored along with their validators, and deserialized
+    on every hit. Least recently used entries are evicted as soon as the
+    bodies weight more than ``max_size`` bytes in total. Hit, miss and
+    revalidation counters are kept for each process.
+    """
+
+    def __init__(self, path, max_size=256 * 1024 * 1024, timeout=30):
+        global sqlite3
+        if sqlite3 is None:
+            try:
+                import sqlite3
+            except ImportError:
+                raise exceptions.ImproperlyConfigured("sqlite3 is required to use DiskCache")
+        super(DiskCache, self).__init__(max_entries=None, max_size=max_size)
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._transaction() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, url TEXT, body BLOB, "
+                       "content_type TEXT, etag TEXT, last_modified TEXT, expires REAL, size INTEGER, "
+                       "accessed REAL)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_url ON entries (url)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __getstate__(self):
+        return {"path": self.path, "max_size": self.max_size, "timeout": self.timeout}
+
+    def _connect(self):
+        # SQLite connections can't be shared between threads, nor survive a fork.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _dump_key(self, key):
+        return json.dumps(key, default=unicode)
+
+    def get(self, key):
+        key = self._dump_key(key)
+        db = self._connect()
+        row = db.execute("SELECT url, body, content_type, etag, last_modified, expires, size FROM entries "
+                         "WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        url, body, content_type, etag, last_modified, expires, size = row
+        return CacheEntry(url, None, size, etag=etag, last_modified=last_modified, expires=expires,
+                          body=bytes(body), content_type=content_type, key=key)
+
+    def set(self, key, response, content):
+        validity = self.get_validity(response)
+        body = response.content or b""
+        if isinstance(body, unicode):
+            body = body.encode("utf-8")
+
+        with self._transaction() as db:
+            if validity is None or len(body) > self.max_size:
+                db.execute("DELETE FROM entries WHERE key = ?", (self._dump_key(key),))
+                return None
+
+            expires, etag, last_modified = validity
+            entry = CacheEntry(key[0], content, len(body), etag=etag, last_modified=last_modified, expires=expires,
+                               body=body, content_type=response.headers.get("content-type"),
+                               key=self._dump_key(key))
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       (entry.key, entry.url, sqlite3.Binary(body), entry.content_type, etag, last_modified,
+                        expires, entry.size, time.time()))
+            self._evict(db)
+        return entry
+
+    def refresh(self, entry, response):
+        super(DiskCache, self).refresh(entry, response)
+        self._connect().execute("UPDATE entries SET expires = ?, etag = ?, last_modified = ? WHERE key = ?",
+                                (entry.expires, entry.etag, entry.last_modified, entry.key))
+        return entry
+
+    def invalidate(self, url):
+        self._connect().execute("DELETE FROM entries WHERE url = ?", (url,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM entries")
+
+    def stats(self):
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "entries": entries,
+            "size": size,
+        }
+
+    def _evict(self, db):
+        size = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if size <= self.max_size:
+            return
+        for key, entry_size in db.execute("SELECT key, size FROM entries ORDER BY accessed, rowid").fetchall():
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            size -= entry_size
+            if size <= self.max_size:
+                break
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, unicode_literals
+
+import time, zlib
+
+from . import exceptions
+from .retry import Counters
+
+__all__ = ["RequestCompressor", "get_accept_encoding"]
+
+# CPU time of the calling thread, of the process before Python 3.7, and
+# time.clock on Python 2 which is the processor time on Unix.
+_cpu_time = getattr(time, "thread_time", None) or getattr(time, "process_time", None) or time.clock
+
+_accept_encoding = None
+
+
+def get_accept_encoding():
+    """
+    Returns the Accept-Encoding of the responses urllib3 decodes as they
+    are read, brotli only when it can import it.
+    """
+    global _accept_encoding
+    if _accept_encoding is None:
+        import urllib3.response
+        _accept_encoding = "gzip, deflate, br" if getattr(urllib3.response, "brotli", None) else "gzip, deflate"
+    return _accept_encoding
+
+
+def _import_brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _gzip(level):
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def _deflate(level):
+    return zlib.compressobj(level)
+
+
+class _Brotli(object):
+    """
+    Gives a brotli compressor the interface of zlib's.
+    """
+
+    def __init__(self, level):
+        self._compressor = _import_brotli().Compressor(quality=min(level, 11))
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class RequestCompressor(Counters):
+    """
+    Compresses the request bodies of at least ``threshold`` bytes with
+    ``encoding`` ("gzip", "deflate" or "br" if brotli is installed) and counts
+    the bytes saved and the CPU time spent doing it, in seconds.
+
+    The server has to accept the Content-Encoding of the requests.
+    """
+
+    counters = ("compressed", "skipped", "bytes_in", "bytes_out", "compress_time")
+
+    encoders = {"gzip": _gzip, "deflate": _deflate, "br": _Brotli}
+
+    def __init__(self, encoding="gzip", level=6, threshold=1024):
+        if encoding not in self.encoders:
+            raise exceptions.ImproperlyConfigured("%s is not a supported content encoding" % encoding)
+        if encoding == "br" and _import_brotli() is None:
+            raise exceptions.ImproperlyConfigured("brotli is required to compress requests with br")
+        super(RequestCompressor, self).__init__()
+        self.encoding = encoding
+        self.level = level
+        self.threshold = threshold
+        self._encoder = self.encoders[encoding]
+
+    def compress(self, data):
+        """
+        Returns the body to send and its Content-Encoding, None when it was
+        left as is.
+        """
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        if len(data) < self.threshold:
+            self.count("skipped")
+            return data, None
+
+        started = _cpu_time()
+        encoder = self._encoder(self.level)
+        compressed = encoder.compress(data) + encoder.flush()
+        self._record(1, len(data), len(compressed), _cpu_time() - started)
+        return compressed, self.encoding
+
+    def compress_iter(self, chunks):
+        """
+        Compresses a body made of ``chunks`` as they are consumed, whatever
+        its size.
+        """
+        encoder = self._encoder(self.level)
+        for chunk in chunks:
+            started = _cpu_time()
+            compressed = encoder.compress(chunk)
+            self._record(0, len(chunk), len(compressed), _cpu_time() - started)
+            # An empty chunk would end a chunked body.
+            if compressed:
+                yield compressed
+        started = _cpu_time()
+        compressed = encoder.flush()
+        self._record(1, 0, len(compressed), _cpu_time() - started)
+        yield compressed
+
+    def _record(self, compressed, bytes_in, bytes_out, elapsed):
+        with self._lock:
+            self.compressed += compressed
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.compress_time += elapsed
+
+    def stats(self):
+        stats = super(RequestCompressor, self).stats()
+        stats["ratio"] = stats["bytes_out"] / stats["bytes_in"] if stats["bytes_in"] else None
+        return stats
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from requests.adapters import HTTPAdapter
+
+__all__ = ["mount_adapters", "reset_pools", "get_pool_stats", "count_connections"]
+
+
+def mount_adapters(session, pool_connections=10, pool_maxsize=10, pool_block=False, keepalive=True):
+    """
+    Mounts HTTP adapters with the given pool sizes on ``session``.
+
+    ``pool_connections`` is the number of hosts whose pools are kept and
+    ``pool_maxsize`` the number of connections kept per host. It should be at
+    least the number of threads sharing the session, or connections get
+    discarded. With ``pool_block``, threads wait for a free connection instead
+    of opening extra ones.
+    """
+    for prefix in ("http://", "https://"):
+        session.mount(prefix, HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                          pool_block=pool_block))
+    if not keepalive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def reset_pools(session):
+    """
+    Gives the HTTP adapters of ``session`` new, empty connection pools, for
+    use in a forked process: the connections inherited from the parent share
+    their sockets with it. The old pools are dropped without being closed.
+    """
+    adapters = getattr(session, "adapters", None)
+    if not isinstance(adapters, dict):
+        return
+    for adapter in adapters.values():
+        if isinstance(adapter, HTTPAdapter):
+            adapter.proxy_manager = {}
+            adapter.init_poolmanager(adapter._pool_connections, adapter._pool_maxsize, block=adapter._pool_block)
+
+
+def get_pool_stats(session):
+    """
+    Returns the connection pool statistics of every host ``session`` talked
+    to, keyed by "scheme://host:port".
+    """
+    stats = {}
+    for adapter in set(session.adapters.values()):
+        poolmanager = getattr(adapter, "poolmanager", None)
+        if poolmanager is None:
+            continue
+        for key in list(poolmanager.pools.keys()):
+            pool = poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            # The queue holds idle connections and None placeholders; what is
+            # missing from it is checked out by a request.
+            queued = list(pool.pool.queue) if pool.pool else []
+            idle = len([conn for conn in queued if conn is not None])
+            in_use = max(pool.pool.maxsize - len(queued), 0) if pool.pool else 0
+            num_requests, created = pool.num_requests, pool.num_connections
+            stats["%s://%s:%s" % (pool.scheme, pool.host, pool.port)] = {
+                "open": idle + in_use,
+                "idle": idle,
+                "in_use": in_use,
+                "created": created,
+                "requests": num_requests,
+                "reuse_ratio": 1.0 - float(created) / num_requests if num_requests else 0.0,
+            }
+    return stats
+
+
+def count_connections(session, url):
+    """
+    Returns how many connections ``session``, or a transport with a urllib3
+    pool manager, opened so far to the host of ``url``, or None when it can't
+    be known.
+    """
+    try:
+        manager = getattr(session, "poolmanager", None) or session.get_adapter(url).poolmanager
+        pool = manager.connection_from_url(url)
+    except AttributeError:
+        return None
+    count = getattr(pool, "num_connections", None)
+    return count if isinstance(count, int) else None
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, unicode_literals
+
+import io, json, mmap, os, re, threading
+from timeit import default_timer as _timer
+
+from . import exceptions, parallel
+
+__all__ = ["Progress", "download", "parse_content_range"]
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+_UNSATISFIED_RANGE_RE = re.compile(r"bytes\s+\*/(\d+)")
+
+# Appended to the path of a file being downloaded to name the file keeping
+# the validator and the size of the body, so that it can be resumed safely.
+STATE_SUFFIX = ".slumber"
+
+
+def parse_content_range(value):
+    """
+    Returns the first byte and the total size, None if unknown, of a
+    Content-Range header.
+    """
+    match = _CONTENT_RANGE_RE.match(value or "")
+    if match is None:
+        raise exceptions.DownloadError("Invalid Content-Range: %s" % value)
+    start, _, total = match.groups()
+    return int(start), None if total == "*" else int(total)
+
+
+def _get_length(response):
+    length = response.headers.get("content-length")
+    return int(length) if length and length.isdigit() else None
+
+
+def _get_validator(response):
+    """
+    Returns the validator an If-Range header can carry: a strong ETag, or
+    else the Last-Modified date.
+    """
+    etag = response.headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("last-modified")
+
+
+def _read_state(path):
+    try:
+        with io.open(path + STATE_SUFFIX, "rb") as f:
+            state = json.loads(f.read().decode("utf-8"))
+    except (IOError, OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _write_state(path, validator, total):
+    with io.open(path + STATE_SUFFIX, "wb") as f:
+        f.write(json.dumps({"validator": validator, "total": total}).encode("utf-8"))
+
+
+def _remove_state(path):
+    try:
+        os.remove(path + STATE_SUFFIX)
+    except OSError:
+        pass
+
+
+def _split(size, parts):
+    step = -(-size // parts)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+class Progress(object):
+    """
+    Counts the bytes received by the connections of a download and calls
+    ``callback`` with the bytes downloaded so far and the total size, None
+    if unknown.
+    """
+
+    def __init__(self, total, callback=None, done=0):
+        self.total = total
+        self.done = done
+        self.received = 0
+        self.callback = callback
+        self.started = _timer()
+        self._lock = threading.Lock()
+
+    def add(self, size):
+        with self._lock:
+            self.done += size
+            self.received += size
+            done = self.done
+        if self.callback is not None:
+            self.callback(done, self.total)
+
+    def stats(self):
+        elapsed = _timer() - self.started
+        return {
+            "size": self.done,
+            "total": self.total,
+            "received": self.received,
+            "elapsed": elapsed,
+            "throughput": self.received / elapsed if elapsed else 0.0,
+        }
+
+
+class _Target(object):
+    """
+    Writes at the given positions of a file, memory mapped or not, of a
+    writable buffer such as a bytearray, or of a file-like object written to
+    in sequence.
+    """
+
+    def __init__(self, dest, size, start, preallocate=False, memory_map=False):
+        self.buffer = self.file = self._map = None
+        self.owned = isinstance(dest, basestring)
+        self._lock = threading.Lock()
+        if self.owned:
+            self.file = io.open(dest, "r+b" if start else "w+b")
+            if (preallocate or memory_map) and size:
+                self.file.truncate(size)
+            if memory_map and size:
+                self.buffer = self._map = mmap.mmap(self.file.fileno(), size)
+        elif hasattr(dest, "write"):
+            self.file = dest
+        else:
+            # Slice assignment past the end would append instead.
+            if size is not None and len(dest) < size:
+                raise exceptions.DownloadError("The buffer holds %d bytes, %d are needed" % (len(dest), size))
+            self.buffer = dest
+
+    @property
+    def seekable(self):
+        return self.buffer is not None or self.owned
+
+    def write(self, position, data):
+        if self.buffer is not None:
+            self.buffer[position:position + len(data)] = data
+            return
+        with self._lock:
+            if self.owned:
+                self.file.seek(position)
+            self.file.write(data)
+
+    def close(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+        if self.owned:
+            self.file.close()
+
+
+def _copy(response, target, position, end, chunk_size, progress):
+    """
+    Writes the body of ``response`` to ``target`` from ``position`` on, up
+    to ``end`` if given.
+    """
+    for chunk in response.iter_content(chunk_size):
+        if end is not None and position + len(chunk) > end:
+            chunk = chunk[:end - position]
+        if chunk:
+            target.write(position, chunk)
+            position += len(chunk)
+            progress.add(len(chunk))
+        if end is not None and position >= end:
+            break
+    if end is not None and position < end:
+        raise exceptions.DownloadError("The download stopped at byte %d out of %d" % (position, end))
+
+
+def download(fetch, dest, chunk_size=DEFAULT_CHUNK_SIZE, resume=True, connections=1, preallocate=False,
+             memory_map=False, progress=None):
+    """
+    Downloads the body of the response returned by ``fetch``, called with
+    the request headers, to ``dest`` and returns the size, time taken and
+    throughput. See Resource.download.
+
+    While a file is downloaded in sequence, the validator and the size of
+    the body are kept next to it. A partial file is only resumed with them,
+    with an If-Range request, and is downloaded again from the start when
+    the body changed.
+    """
+    # Ranges are counted on the bytes sent, which must not be compressed.
+    headers = {"accept-encoding": "identity"}
+    if hasattr(dest, "write"):
+        connections = 1
+    resumable = isinstance(dest, basestring) and connections == 1 and not (preallocate or memory_map)
+
+    offset, state = 0, None
+    if resumable and resume and os.path.exists(dest):
+        state = _read_state(dest)
+        if state is not None:
+            offset = os.path.getsize(dest)
+
+    def restart():
+        if resumable:
+            _remove_state(dest)
+        return download(fetch, dest, chunk_size=chunk_size, resume=False, progress=progress)
+
+    if offset or connections > 1:
+        headers["Range"] = "bytes=%d-" % offset
+    if offset and state.get("validator"):
+        headers["If-Range"] = state["validator"]
+    try:
+        response = fetch(headers)
+    except exceptions.HttpClientError as e:
+        if e.response.status_code != 416 or not offset:
+            raise
+        match = _UNSATISFIED_RANGE_RE.match(e.response.headers.get("content-range") or "")
+        total = int(match.group(1)) if match else None
+        if offset != state.get("total") or total != offset:
+            # The file is larger than the body, it isn't a part of it.
+            return restart()
+        # Nothing left past the offset.
+        _remove_state(dest)
+        return Progress(offset, progress, done=offset).stats()
+
+    try:
+        if response.status_code == 206:
+            start, total = parse_content_range(response.headers.get("content-range"))
+            validator = _get_validator(response)
+            if offset and (start != offset or total != state.get("total") or
+                           (state.get("validator") and validator != state["validator"])):
+                response.close()
+                return restart()
+        else:
+            # The body changed since the partial file, or ranges are ignored:
+            # the whole body comes.
+            start, total, validator = 0, _get_length(response), _get_validator(response)
+        if resumable:
+            _write_state(dest, validator, total)
+        report = Progress(total, progress, done=start)
+        target = _Target(dest, total, start, preallocate, memory_map)
+        try:
+            if response.status_code != 206 or start != 0 or not total or total <= chunk_size or \
+                    not target.seekable:
+                _copy(response, target, start, total, chunk_size, report)
+                if resumable:
+                    target.file.flush()
+                    size = os.fstat(target.file.fileno()).st_size
+                    if total is not None and size != total:
+                        raise exceptions.DownloadError("The file holds %d bytes out of %d" % (size, total))
+                    _remove_state(dest)
+                return report.stats()
+
+            parts = _split(total, connections)
+
+            def download_part(index):
+                part_start, part_end = parts[index]
+                if index == 0:
+                    part = response
+                else:
+                    part_headers = dict(headers, Range="bytes=%d-%d" % (part_start, part_end - 1))
+                    if validator:
+                        # Parts of another version of the body are refused.
+                        part_headers["If-Range"] = validator
+                    part = fetch(part_headers)
+                    if part.status_code != 206:
+                        part.close()
+                        raise exceptions.DownloadError("Range request answered with %s" % part.status_code)
+                try:
+                    _copy(part, target, part_start, part_end, chunk_size, report)
+                finally:
+                    part.close()
+
+            for result in parallel.thread_map(download_part, range(len(parts)), max_workers=connections):
+                if isinstance(result, Exception):
+                    raise result
+            return report.stats()
+        finally:
+            target.close()
+    finally:
+        response.close()
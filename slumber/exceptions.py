@@ -20,6 +20,10 @@ class SlumberHttpBaseException(SlumberBaseException):
                                                   response.status_code, response.reason, response.url, response.text)
         super(SlumberHttpBaseException, self).__init__(value)
 
+    def __reduce__(self):
+        # Unpickled from the response, like it was built.
+        return self.__class__, (self.response,)
+
 
 class HttpClientError(SlumberHttpBaseException):
     """
@@ -49,3 +53,21 @@ class ImproperlyConfigured(SlumberBaseException):
     """
     Slumber is somehow improperly configured.
     """
+
+
+class CircuitOpenError(SlumberBaseException):
+    """
+    The circuit breaker of the host is open, the request was not sent.
+    """
+
+
+class ReplayMissError(SlumberBaseException):
+    """
+    The replayed recording has no response for the request.
+    """
+
+
+class DownloadError(SlumberBaseException):
+    """
+    The body of a download was cut short or its ranges can't be trusted.
+    """
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, unicode_literals
+
+import threading, Queue
+from timeit import default_timer as _timer
+
+from .instrumentation import Histogram
+from .retry import Counters
+
+__all__ = ["HedgePolicy"]
+
+
+class HedgePolicy(Counters):
+    """
+    Sends a second copy of a GET still unanswered after ``delay`` seconds and
+    returns whichever response comes first, the other one being discarded.
+    Requests in flight can't be cancelled.
+
+    Without ``delay``, it is the ``percentile`` latency observed for the
+    endpoint (its URL template) once ``min_samples`` requests were answered,
+    and ``initial_delay`` until then. Hedges are only sent while they make
+    less than ``max_ratio`` of the requests, so that a slow backend doesn't
+    get twice the load.
+    """
+
+    counters = ("requests", "hedged", "hedge_wins", "capped")
+
+    def __init__(self, delay=None, percentile=95, initial_delay=0.1, min_delay=0.001, min_samples=20, max_ratio=0.1):
+        super(HedgePolicy, self).__init__()
+        self.delay = delay
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        # Latency histogram and current delay of every template.
+        self._latencies = {}
+
+    def get_delay(self, template):
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None or latencies[1] is None:
+                return self.initial_delay
+            return latencies[1]
+
+    def record(self, template, elapsed):
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None:
+                latencies = self._latencies[template] = [Histogram(), None]
+            histogram = latencies[0]
+            histogram.add(elapsed)
+            # The percentile is only computed again every few requests.
+            if histogram.count >= self.min_samples and (latencies[1] is None or histogram.count % 10 == 0):
+                latencies[1] = max(self.min_delay, histogram.percentile(self.percentile))
+
+    def allow_hedge(self):
+        with self._lock:
+            if self.hedged + 1 > self.max_ratio * self.requests:
+                self.capped += 1
+                return False
+            self.hedged += 1
+            return True
+
+    def send(self, request, template):
+        """
+        Calls ``request``, twice if the first call is too slow, and returns
+        the first response. Errors are only raised when both calls failed.
+        """
+        self.count("requests")
+        outcomes = Queue.Queue()
+
+        def attempt(hedge):
+            started = _timer()
+            try:
+                response = request()
+            except Exception as e:
+                outcomes.put((hedge, None, e))
+                return
+            self.record(template, _timer() - started)
+            outcomes.put((hedge, response, None))
+
+        def start(hedge):
+            thread = threading.Thread(target=attempt, args=(hedge,))
+            thread.daemon = True
+            thread.start()
+
+        start(False)
+        pending = 1
+        try:
+            outcome = outcomes.get(timeout=self.get_delay(template))
+        except Queue.Empty:
+            if self.allow_hedge():
+                start(True)
+                pending += 1
+            outcome = outcomes.get()
+
+        error = None
+        while True:
+            pending -= 1
+            hedge, response, e = outcome
+            if e is None:
+                if hedge:
+                    self.count("hedge_wins")
+                return response
+            error = error or e
+            if not pending:
+                raise error
+            outcome = outcomes.get()
+
+    def stats(self):
+        stats = super(HedgePolicy, self).stats()
+        stats["hedge_rate"] = self.hedged / self.requests if self.requests else 0.0
+        stats["win_rate"] = self.hedge_wins / self.hedged if self.hedged else 0.0
+        with self._lock:
+            stats["delays"] = dict((template, latencies[1]) for template, latencies in self._latencies.items()
+                                   if latencies[1] is not None)
+        return stats
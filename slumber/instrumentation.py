@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, unicode_literals
+
+import math, threading, time
+from datetime import timedelta
+
+__all__ = ["RequestEvent", "Histogram", "HistogramAggregator"]
+
+
+def get_size(data):
+    """
+    Returns the size in bytes of a request body, None if it isn't known.
+    """
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, unicode):
+        return len(data.encode("utf-8"))
+    return None if data else 0
+
+
+def record_response(event, response, stream=False):
+    event.status_code = response.status_code
+    if stream:
+        length = response.headers.get("content-length")
+        event.bytes_received = int(length) if length else None
+    else:
+        event.bytes_received = len(response.content or b"")
+    elapsed = getattr(response, "elapsed", None)
+    if isinstance(elapsed, timedelta):
+        event.time_to_headers = elapsed.total_seconds()
+
+
+def emit(listeners, event):
+    for listener in listeners:
+        listener(event)
+
+
+class RequestEvent(object):
+    """
+    What happened during one request, passed to the listeners of the API.
+
+    Times are in seconds. ``request_time`` covers the whole HTTP exchange,
+    retries included, and ``time_to_headers`` the part until the response
+    headers were parsed. Values that could not be measured are None.
+    """
+
+    __slots__ = ("method", "url", "url_template", "status_code", "bytes_sent", "bytes_received", "serialize_time",
+                 "request_time", "time_to_headers", "deserialize_time", "attempts", "connection_reused", "error",
+                 "timestamp")
+
+    def __init__(self, method, url, url_template):
+        self.method = method
+        self.url = url
+        self.url_template = url_template
+        self.status_code = self.bytes_sent = self.bytes_received = None
+        self.serialize_time = self.request_time = self.time_to_headers = self.deserialize_time = None
+        self.attempts = 0
+        self.connection_reused = None
+        self.error = None
+        self.timestamp = time.time()
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+    @property
+    def total_time(self):
+        return sum(t for t in (self.serialize_time, self.request_time, self.deserialize_time) if t is not None)
+
+    def as_dict(self):
+        data = dict((name, getattr(self, name)) for name in self.__slots__)
+        data["retries"] = self.retries
+        data["total_time"] = self.total_time
+        return data
+
+
+class Histogram(object):
+    """
+    Log-linear histogram: values are counted in buckets growing by
+    ``precision`` (10% by default), so percentiles are within that much of
+    the truth whatever the number of values recorded.
+    """
+
+    def __init__(self, precision=0.1, lowest=1e-6):
+        self.lowest = lowest
+        self._log_growth = math.log(1 + precision)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = self.max = None
+
+    def add(self, value):
+        index = int(math.log(max(value, self.lowest) / self.lowest) / self._log_growth)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, point):
+        if not self.count:
+            return None
+        rank = point / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Upper bound of the bucket, never beyond what was seen.
+                return min(self.lowest * math.exp((index + 1) * self._log_growth), self.max)
+        return self.max
+
+    def summary(self, points=(50, 90, 99)):
+        result = {"count": self.count, "mean": self.total / self.count if self.count else None, "max": self.max}
+        for point in points:
+            result["p%d" % point] = self.percentile(point)
+        return result
+
+
+class HistogramAggregator(object):
+    """
+    A listener keeping, for every method and URL template, histograms of the
+    time spent serializing, on the network and deserializing::
+
+        aggregator = HistogramAggregator()
+        api = slumber.API("http://path/to/my/api/", listeners=[aggregator])
+        ...
+        aggregator.stats()["GET http://path/to/my/api/thing/{id}/"]["request_time"]["p99"]
+    """
+
+    timings = ("serialize_time", "request_time", "deserialize_time", "total_time")
+
+    def __init__(self, precision=0.1):
+        self.precision = precision
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Every process aggregates its own requests.
+        return {"precision": self.precision}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __call__(self, event):
+        key = "%s %s" % (event.method, event.url_template)
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = {
+                    "requests": 0, "errors": 0, "retries": 0, "reused_connections": 0,
+                    "bytes_sent": 0, "bytes_received": 0,
+                    "histograms": dict((name, Histogram(self.precision)) for name in self.timings),
+                }
+            endpoint["requests"] += 1
+            endpoint["errors"] += 1 if event.error is not None else 0
+            endpoint["retries"] += event.retries
+            endpoint["reused_connections"] += 1 if event.connection_reused else 0
+            endpoint["bytes_sent"] += event.bytes_sent or 0
+            endpoint["bytes_received"] += event.bytes_received or 0
+            for name in self.timings:
+                value = getattr(event, name)
+                if value is not None:
+                    endpoint["histograms"][name].add(value)
+
+    def stats(self):
+        with self._lock:
+            stats = {}
+            for key, endpoint in self._endpoints.items():
+                stats[key] = dict((k, v) for k, v in endpoint.items() if k != "histograms")
+                for name, histogram in endpoint["histograms"].items():
+                    stats[key][name] = histogram.summary()
+            return stats
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
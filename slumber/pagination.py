@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import urlparse
+
+__all__ = ["Paginator", "NextUrlPaginator", "OffsetPaginator", "CursorPaginator", "iter_pages"]
+
+
+def _lookup(data, path):
+    for key in path.split(".") if path else ():
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+class Paginator(object):
+    """
+    A pagination strategy tells how to find the items of a page and how to
+    request the next one.
+    """
+
+    items_key = None
+
+    def get_params(self, params):
+        """
+        Returns the query parameters of the first page.
+        """
+        return params
+
+    def get_items(self, page):
+        if isinstance(page, list):
+            return page
+        return _lookup(page, self.items_key) or []
+
+    def get_next(self, resource, page, params):
+        """
+        Returns the (resource, params) to get the page following ``page``, or
+        None if it is the last one.
+        """
+        raise NotImplementedError()
+
+
+class NextUrlPaginator(Paginator):
+    """
+    Follows the link to the next page, "meta.next" for Tastypie and "next"
+    for Django REST framework by default.
+    """
+
+    def __init__(self, next_key=None, items_key=None):
+        self.next_key = next_key
+        self.items_key = items_key
+
+    def get_items(self, page):
+        if self.items_key is None and isinstance(page, dict):
+            return page.get("objects", page.get("results")) or []
+        return super(NextUrlPaginator, self).get_items(page)
+
+    def get_next(self, resource, page, params):
+        if not isinstance(page, dict):
+            return None
+        if self.next_key is not None:
+            url = _lookup(page, self.next_key)
+        else:
+            url = _lookup(page, "meta.next") if "meta" in page else page.get("next")
+        if not url:
+            return None
+
+        # The query string goes to params, append_slash would mangle it otherwise.
+        scheme, netloc, path, query, fragment = urlparse.urlsplit(urlparse.urljoin(resource._store["base_url"], url))
+        params = dict(urlparse.parse_qsl(query, keep_blank_values=True))
+        return resource(url_override=urlparse.urlunsplit([scheme, netloc, path, "", ""])), params
+
+
+class OffsetPaginator(Paginator):
+    """
+    Increments an offset parameter until a page has less than ``limit`` items.
+    """
+
+    def __init__(self, limit=20, items_key="objects", offset_param="offset", limit_param="limit"):
+        self.limit = limit
+        self.items_key = items_key
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+
+    def get_params(self, params):
+        params = dict(params)
+        params.setdefault(self.limit_param, self.limit)
+        return params
+
+    def get_next(self, resource, page, params):
+        count = len(self.get_items(page))
+        if count < int(params[self.limit_param]):
+            return None
+        params = dict(params)
+        params[self.offset_param] = int(params.get(self.offset_param, 0)) + count
+        return resource, params
+
+
+class CursorPaginator(Paginator):
+    """
+    Passes the opaque cursor found at ``cursor_key`` to the next request.
+    """
+
+    def __init__(self, cursor_key="next_cursor", cursor_param="cursor", items_key="objects"):
+        self.cursor_key = cursor_key
+        self.cursor_param = cursor_param
+        self.items_key = items_key
+
+    def get_next(self, resource, page, params):
+        cursor = _lookup(page, self.cursor_key) if isinstance(page, dict) else None
+        if not cursor:
+            return None
+        params = dict(params)
+        params[self.cursor_param] = cursor
+        return resource, params
+
+
+def iter_pages(resource, paginator, params):
+    """
+    Yields the pages of ``resource`` one after the other.
+    """
+    params = paginator.get_params(params)
+    while resource is not None:
+        page = resource.get(**params)
+        yield page
+        resource, params = paginator.get_next(resource, page, params) or (None, None)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import collections, sys, threading, Queue
+
+from . import exceptions
+
+__all__ = ["thread_map", "bounded_map", "process_map", "prefetch"]
+
+_DONE = object()
+
+# The function process_map calls, set in every worker process.
+_process_func = None
+
+
+def _capture_http_errors(func):
+    def wrapper(item):
+        try:
+            return func(item)
+        except exceptions.SlumberHttpBaseException as e:
+            return e
+    return wrapper
+
+
+def _init_process(func):
+    global _process_func
+    _process_func = _capture_http_errors(func)
+
+
+def _call_process_func(item):
+    return _process_func(item)
+
+
+def thread_map(func, items, max_workers=10):
+    """
+    Calls ``func`` on every item using at most ``max_workers`` threads and
+    returns the results in the order of ``items``. HTTP errors are returned in
+    place of the result instead of aborting the whole batch.
+    """
+    items = list(items)
+    func = _capture_http_errors(func)
+    workers = min(max_workers, len(items))
+
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    # multiprocessing is slow to import and seldom needed.
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(func, items, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def bounded_map(func, items, max_workers=10, max_pending=None):
+    """
+    Like thread_map, but consumes ``items`` lazily and yields the results in
+    order as they come. At most ``max_pending`` items (twice ``max_workers``
+    by default) are being processed or waiting to be yielded, so a producer
+    faster than the workers is held back instead of filling the memory.
+    """
+    func = _capture_http_errors(func)
+    max_pending = max_pending or 2 * max_workers
+    pending = collections.deque()
+
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(max_workers)
+    try:
+        for item in items:
+            pending.append(pool.apply_async(func, (item,)))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.close()
+        pool.join()
+
+
+def process_map(func, items, processes=None, chunksize=1):
+    """
+    Like thread_map, but calls ``func`` in a pool of ``processes`` processes,
+    one per CPU by default, for CPU bound work. ``func`` is sent once to each
+    process; it, the items and the results must be picklable.
+    """
+    import multiprocessing
+
+    items = list(items)
+    processes = min(processes or multiprocessing.cpu_count(), len(items))
+
+    if processes <= 1:
+        return [_capture_http_errors(func)(item) for item in items]
+
+    pool = multiprocessing.Pool(processes, initializer=_init_process, initargs=(func,))
+    try:
+        return pool.map(_call_process_func, items, chunksize=chunksize)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def prefetch(iterable, depth=1):
+    """
+    Consumes ``iterable`` in a background thread, staying at most ``depth``
+    items ahead of the caller, so no more than ``depth`` + 1 items are held in
+    memory. Exceptions raised by the iterable are raised again in the caller.
+    """
+    items, credits = Queue.Queue(), Queue.Queue()
+    stop = threading.Event()
+    for _ in range(depth):
+        credits.put(None)
+
+    def wait_for_credit():
+        while not stop.is_set():
+            try:
+                credits.get(timeout=0.1)
+                return True
+            except Queue.Empty:
+                pass
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            while wait_for_credit():
+                try:
+                    items.put((next(iterator), None))
+                except StopIteration:
+                    items.put((_DONE, None))
+                    return
+        except Exception:
+            items.put((_DONE, sys.exc_info()))
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item, exc_info = items.get()
+            if item is _DONE:
+                if exc_info is not None:
+                    raise exc_info[1]
+                return
+            credits.put(None)
+            yield item
+    finally:
+        stop.set()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, unicode_literals
+
+import threading, time, urlparse
+
+from .retry import Counters, parse_retry_after
+
+__all__ = ["TokenBucket", "RateLimiter"]
+
+
+class TokenBucket(object):
+    """
+    Lets through ``rate`` requests per second on average and bursts of up to
+    ``burst``. Callers beyond that are queued: each one reserves the next
+    token and sleeps until it is available, so they go in arrival order.
+
+    The rate moves between ``min_rate`` and ``max_rate``: it is halved on
+    throttling and grows back by ``increase`` requests per second after every
+    successful request.
+    """
+
+    def __init__(self, rate, burst=None, min_rate=None, max_rate=None, increase=None):
+        self.rate = float(rate)
+        self.burst = burst or max(1.0, self.rate)
+        self.min_rate = min_rate or self.rate / 100
+        self.max_rate = max_rate or self.rate
+        self.increase = self.rate / 20 if increase is None else increase
+        self.tokens = self.burst
+        self.waiting = 0
+        self.paused_until = 0
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # The tokens and callers waiting for them belong to this process.
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state.update(tokens=self.burst, waiting=0, paused_until=0)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        start = max(self._updated, self.paused_until)
+        if now > start:
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self._updated = max(now, self._updated)
+
+    def acquire(self):
+        """
+        Waits for a token, returns the seconds waited.
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0, self.paused_until - now) + max(0, -self.tokens) / self.rate
+            if wait <= 0:
+                return 0
+            self.waiting += 1
+        try:
+            time.sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        return wait
+
+    def pause(self, seconds):
+        """
+        Lets nothing through for ``seconds``.
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            # A single request goes through at the end of the pause.
+            self.tokens = min(self.tokens, 1)
+            self.paused_until = max(self.paused_until, now + seconds)
+
+    def throttled(self, factor=0.5):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * factor)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def set_rate(self, rate):
+        with self._lock:
+            self.rate = max(self.min_rate, min(self.max_rate, rate))
+
+
+class RateLimiter(Counters):
+    """
+    Client side rate limiting, shared by every thread using the API.
+
+    Requests go through a TokenBucket of ``rate`` requests per second, or the
+    one of the longest matching URL path prefix in ``limits``, e.g.
+    ``{"/api/v1/search/": 2}``. With ``adaptive``, the rate is lowered when
+    the server answers 429 and follows the ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Reset`` headers, then grows back up to ``max_rate``
+    (``rate`` by default) while requests succeed.
+
+    Requests answered with 429 are queued again, up to ``max_requeues``
+    times, after waiting what the ``Retry-After`` header says.
+    """
+
+    counters = ("requests", "throttled", "requeued", "waited")
+
+    def __init__(self, rate=10, burst=None, limits=None, adaptive=True, min_rate=None, max_rate=None,
+                 max_requeues=5):
+        super(RateLimiter, self).__init__()
+        self.adaptive = adaptive
+        self.max_requeues = max_requeues
+        self.buckets = {None: TokenBucket(rate, burst, min_rate, max_rate)}
+        for prefix, prefix_rate in (limits or {}).items():
+            self.buckets[prefix] = TokenBucket(prefix_rate, min_rate=min_rate)
+        # Longest prefixes first.
+        self._prefixes = sorted((p for p in self.buckets if p is not None), key=len, reverse=True)
+
+    def get_bucket(self, url):
+        path = urlparse.urlsplit(url).path
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self.buckets[prefix]
+        return self.buckets[None]
+
+    def send(self, request, url, requeue=True):
+        """
+        Calls ``request`` once the rate allows it and returns its response.
+        """
+        bucket = self.get_bucket(url)
+        requeues = 0
+        while True:
+            self.count("requests")
+            self.count("waited", bucket.acquire())
+            response = request()
+            self.observe(bucket, response)
+            if response.status_code != 429 or not requeue or requeues >= self.max_requeues:
+                return response
+            requeues += 1
+            self.count("requeued")
+
+    def observe(self, bucket, response):
+        headers = response.headers
+        if response.status_code == 429:
+            self.count("throttled")
+            if self.adaptive:
+                bucket.throttled()
+            bucket.pause(parse_retry_after(headers.get("retry-after")) or 1 / bucket.rate)
+            return
+
+        if not self.adaptive:
+            return
+        remaining, reset = headers.get("x-ratelimit-remaining"), headers.get("x-ratelimit-reset")
+        try:
+            remaining, reset = int(remaining), float(reset)
+        except (TypeError, ValueError):
+            bucket.succeeded()
+            return
+        # Reset is either a delay or, for large values, a timestamp.
+        reset_in = reset - time.time() if reset > 1e9 else reset
+        if remaining <= 0:
+            bucket.pause(max(reset_in, 0))
+        else:
+            bucket.set_rate(remaining / max(reset_in, 1))
+
+    def stats(self):
+        stats = super(RateLimiter, self).stats()
+        stats["rates"] = dict((prefix or "*", bucket.rate) for prefix, bucket in self.buckets.items())
+        stats["queued"] = sum(bucket.waiting for bucket in self.buckets.values())
+        return stats
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import random, threading, time, urlparse
+from email.utils import mktime_tz, parsedate_tz
+
+import requests
+
+from . import exceptions
+
+__all__ = ["RetryPolicy", "CircuitBreaker", "guard", "send"]
+
+
+def parse_retry_after(value):
+    """
+    Returns the seconds to wait according to a Retry-After header, given in
+    seconds or as an HTTP date, None if it is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0, int(value))
+    except ValueError:
+        parsed = parsedate_tz(value)
+        return max(0, mktime_tz(parsed) - time.time()) if parsed else None
+
+
+class Counters(object):
+    """
+    Thread safe counters, readable as attributes.
+    """
+
+    counters = ()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        for counter in self.counters:
+            setattr(self, counter, 0)
+
+    def count(self, counter, value=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def stats(self):
+        return dict((counter, getattr(self, counter)) for counter in self.counters)
+
+    def __getstate__(self):
+        # Pickled as configuration, the counters start again from zero.
+        state = dict(self.__dict__)
+        del state["_lock"]
+        state.update((counter, 0) for counter in self.counters)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class RetryPolicy(Counters):
+    """
+    Retries idempotent requests failing with a retryable status or a
+    connection error, waiting an exponentially growing and jittered delay
+    between attempts.
+
+    The delay before retry ``n`` is picked at random between 0 and
+    ``backoff_factor * 2 ** n``, capped to ``max_backoff``, so that clients
+    don't retry in lockstep. A ``Retry-After`` header takes precedence, but
+    a request asked to wait longer than ``max_backoff`` is not retried. No
+    retry is made past ``budget`` seconds after the first attempt.
+    """
+
+    counters = ("attempts", "retries", "exhausted")
+
+    def __init__(self, total=3, methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"), statuses=(429, 502, 503, 504),
+                 backoff_factor=0.5, max_backoff=30, jitter=True, respect_retry_after=True, budget=None,
+                 connection_errors=True):
+        super(RetryPolicy, self).__init__()
+        self.total = total
+        self.methods = frozenset(m.upper() for m in methods)
+        self.statuses = frozenset(statuses)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget
+        self.connection_errors = connection_errors
+
+    def is_retryable(self, method, status_code=None, error=None):
+        if method.upper() not in self.methods:
+            return False
+        if error is not None:
+            return self.connection_errors
+        return status_code in self.statuses
+
+    def get_backoff(self, retry):
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** retry))
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def get_retry_after(self, response):
+        if response is None or not self.respect_retry_after:
+            return None
+        return parse_retry_after(response.headers.get("retry-after"))
+
+    def get_delay(self, retry, response=None):
+        """
+        Returns the seconds to wait before retry ``retry``, None if the
+        server asks to wait longer than ``max_backoff``.
+        """
+        delay = self.get_retry_after(response)
+        if delay is None:
+            return self.get_backoff(retry)
+        return delay if delay <= self.max_backoff else None
+
+
+class CircuitBreaker(Counters):
+    """
+    Fails fast with CircuitOpenError for a host after ``failure_threshold``
+    consecutive failures (5xx or connection errors). After
+    ``recovery_timeout`` seconds a single trial request is let through (half
+    open): it closes the circuit if it succeeds and opens it again otherwise.
+    """
+
+    counters = ("opened", "half_opened", "closed", "rejected")
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30):
+        super(CircuitBreaker, self).__init__()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._hosts = {}
+
+    def __getstate__(self):
+        state = super(CircuitBreaker, self).__getstate__()
+        state["_hosts"] = {}
+        return state
+
+    def get_state(self, host):
+        return self._hosts.get(host, {"state": self.CLOSED})["state"]
+
+    def before_request(self, host):
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is None or circuit["state"] == self.CLOSED:
+                return
+            if circuit["state"] == self.OPEN and time.time() >= circuit["opened_at"] + self.recovery_timeout:
+                circuit["state"] = self.HALF_OPEN
+                self.half_opened += 1
+                return
+            self.rejected += 1
+        raise exceptions.CircuitOpenError("The circuit of %s is %s" % (host, circuit["state"]))
+
+    def record_success(self, host):
+        with self._lock:
+            circuit = self._hosts.pop(host, None)
+            if circuit is not None and circuit["state"] != self.CLOSED:
+                self.closed += 1
+
+    def record_failure(self, host):
+        with self._lock:
+            circuit = self._hosts.setdefault(host, {"state": self.CLOSED, "failures": 0})
+            circuit["failures"] += 1
+            if circuit["state"] == self.HALF_OPEN or circuit["failures"] >= self.failure_threshold:
+                if circuit["state"] != self.OPEN:
+                    self.opened += 1
+                circuit["state"] = self.OPEN
+                circuit["opened_at"] = time.time()
+
+
+def guard(request, host, breaker):
+    """
+    Calls ``request`` if the circuit of ``host`` lets it through, and records
+    the outcome in ``breaker``.
+    """
+    breaker.before_request(host)
+    try:
+        response = request()
+    except Exception:
+        breaker.record_failure(host)
+        raise
+    if response.status_code >= 500:
+        breaker.record_failure(host)
+    else:
+        breaker.record_success(host)
+    return response
+
+
+def send(request, method, url, policy=None, breaker=None, handled=()):
+    """
+    Calls ``request`` until it returns a response that should not be retried
+    according to ``policy``, and returns it. Connection errors are raised
+    once retries are exhausted. Responses with a status in ``handled`` are
+    not retried.
+    """
+    host = urlparse.urlsplit(url).netloc
+    started = time.time()
+    retry = 0
+
+    while True:
+        if policy is not None:
+            policy.count("attempts")
+
+        response = error = None
+        try:
+            response = guard(request, host, breaker) if breaker is not None else request()
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+
+        status_code = getattr(response, "status_code", None)
+        if policy is None or status_code in handled or not policy.is_retryable(method, status_code, error):
+            break
+
+        delay = policy.get_delay(retry, response)
+        if retry >= policy.total or delay is None or \
+                (policy.budget is not None and time.time() + delay - started > policy.budget):
+            policy.count("exhausted")
+            break
+
+        policy.count("retries")
+        if response is not None:
+            # Gives its connection back to the pool.
+            response.close()
+        time.sleep(delay)
+        retry += 1
+
+    if error is not None:
+        raise error
+    return response
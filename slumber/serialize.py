@@ -2,28 +2,102 @@
 
 from __future__ import absolute_import, unicode_literals
 
-from . import exceptions
-
-_SERIALIZERS = {
-    "json": True,
-    "yaml": True,
-}
+import importlib, sys, threading
 
 try:
-    import json
+    from collections.abc import MutableMapping
 except ImportError:
-    _SERIALIZERS["json"] = False
-
+    from collections import MutableMapping
 try:
-    import yaml
+    from importlib.util import find_spec as _find_module
 except ImportError:
-    _SERIALIZERS["yaml"] = False
+    from pkgutil import find_loader as _find_module
+
+from . import exceptions
+from .stream import iter_json_array
+
+# Serialization libraries, imported the first time a serializer needs them
+# since some, like yaml, are slow to import: the module, None if missing.
+_MODULES = {}
+
+
+def _import(name):
+    """
+    Returns the module ``name``, None if it isn't installed.
+    """
+    try:
+        return _MODULES[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    _MODULES[name] = module
+    return module
+
+
+def _is_installed(name):
+    """
+    Tells whether the module ``name`` is installed, without importing it.
+    """
+    if name in _MODULES:
+        return _MODULES[name] is not None
+    try:
+        return _find_module(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_available(serializer):
+    """
+    Tells whether the libraries needed by a serializer class, or by the one
+    registered with the key ``serializer``, are installed.
+    """
+    if isinstance(serializer, basestring):
+        classes = [x for x in _DEFAULT_SERIALIZERS if x.key == serializer]
+        return any(x.is_available() for x in classes)
+    return serializer.is_available()
+
+
+# json.loads only accepts bytes from Python 3.6 on.
+_JSON_LOADS_BYTES = sys.version_info[0] == 2 or sys.version_info >= (3, 6)
+
+# Size of the chunks yielded by dump_iter.
+DUMP_CHUNK_SIZE = 64 * 1024
+
+
+def _to_bytes(data):
+    return data if isinstance(data, bytes) else data.encode("utf-8")
+
+
+def _buffered(pieces, chunk_size):
+    """
+    Joins consecutive pieces of bytes into chunks of about ``chunk_size``.
+    """
+    buf, size = [], 0
+    for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
 
 
 class BaseSerializer(object):
 
     content_types = None
     key = None
+    # Structured syntax suffixes handled, e.g. "json" for application/vnd.api+json
+    suffixes = ()
+    # Modules needed, imported when the serializer is created.
+    requires = ()
+
+    @classmethod
+    def is_available(cls):
+        return all(_is_installed(name) for name in cls.requires)
 
     def get_content_type(self):
         if self.content_types is None:
@@ -36,8 +110,36 @@ class BaseSerializer(object):
     def dumps(self, data):
         raise NotImplementedError()
 
+    def iter_loads(self, chunks, path=None):
+        """
+        Yields the items of the list found at ``path`` in the document made of
+        ``chunks``. Serializers able to decode incrementally should override
+        this, the default loads the whole document first.
+        """
+        data = self.loads(b"".join(chunks))
+        if isinstance(path, basestring):
+            path = path.split(".")
+        for key in path or ():
+            data = data[key]
+        return iter(data)
+
+    def dump_iter(self, items, chunk_size=DUMP_CHUNK_SIZE):
+        """
+        Yields the document made of the list of ``items`` in chunks of bytes.
+        Serializers able to encode incrementally should override this, the
+        default builds the whole document first.
+        """
+        yield _to_bytes(self.dumps(list(items)))
+
 
 class JsonSerializer(BaseSerializer):
+    """
+    Uses the standard library, or orjson or ujson when asked for with
+    ``backend``. They are faster but don't decode exactly the same: orjson
+    turns integers beyond 64 bits into floats and refuses NaN. Payloads
+    orjson can't encode, like dicts with non string keys, fall back to the
+    standard library. ``dumps`` returns text whatever the backend.
+    """
 
     content_types = [
         "application/json",
@@ -47,58 +149,301 @@ class JsonSerializer(BaseSerializer):
         "text/x-json",
     ]
     key = "json"
+    suffixes = ("json",)
+    requires = ("json",)
+
+    def __init__(self, backend="json"):
+        module = _import(backend)
+        if module is None:
+            raise exceptions.SerializerNotAvailable("%s is not installed" % backend)
+        self.backend = backend
+        self._loads = module.loads
+        self._dumps = module.dumps
+        self._json_dumps = _import("json").dumps
 
     def loads(self, data):
-        return json.loads(data if isinstance(data, unicode) else data.decode('utf-8'))
+        if isinstance(data, bytes) and self.backend == "json" and not _JSON_LOADS_BYTES:
+            data = data.decode("utf-8")
+        return self._loads(data)
 
     def dumps(self, data):
-        return json.dumps(data)
+        data = self._dump_bytes(data)
+        return data.decode("utf-8") if self.backend == "orjson" and isinstance(data, bytes) else data
+
+    def _dump_bytes(self, data):
+        # orjson output is kept as bytes where bytes are wanted.
+        if self.backend == "orjson":
+            try:
+                return self._dumps(data)
+            except TypeError:
+                pass
+        elif self.backend == "ujson":
+            return self._dumps(data)
+        return self._json_dumps(data)
+
+    def iter_loads(self, chunks, path=None):
+        return iter_json_array(chunks, path=path)
+
+    def dump_iter(self, items, chunk_size=DUMP_CHUNK_SIZE):
+        """
+        Encodes the JSON array of ``items`` one item at a time, so only a
+        chunk is held in memory.
+        """
+        def pieces():
+            yield b"["
+            for i, item in enumerate(items):
+                if i:
+                    yield b","
+                yield _to_bytes(self._dump_bytes(item))
+            yield b"]"
+        return _buffered(pieces(), chunk_size)
+
+
+class NdjsonSerializer(JsonSerializer):
+    """
+    Newline delimited JSON: a list whose items are written one per line.
+    """
+
+    content_types = ["application/x-ndjson", "application/ndjson", "application/jsonl"]
+    key = "ndjson"
+    suffixes = ()
+
+    def loads(self, data):
+        return list(self.iter_loads([data]))
+
+    def dumps(self, data):
+        return b"".join(self.dump_iter(data))
+
+    def iter_loads(self, chunks, path=None):
+        pending = b""
+        for chunk in chunks:
+            lines = (pending + _to_bytes(chunk)).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield super(NdjsonSerializer, self).loads(line)
+        if pending.strip():
+            yield super(NdjsonSerializer, self).loads(pending)
+
+    def dump_iter(self, items, chunk_size=DUMP_CHUNK_SIZE):
+        return _buffered((_to_bytes(self._dump_bytes(item)) + b"\n" for item in items), chunk_size)
 
 
 class YamlSerializer(BaseSerializer):
 
-    content_types = ["text/yaml"]
+    content_types = ["text/yaml", "application/yaml", "application/x-yaml"]
     key = "yaml"
+    suffixes = ("yaml",)
+    requires = ("yaml",)
+
+    def __init__(self):
+        yaml = _import("yaml")
+        self._load, self._dump = yaml.safe_load, yaml.dump
 
     def loads(self, data):
-        return yaml.safe_load(data if isinstance(data, unicode) else data.decode('utf-8'))
+        return self._load(data if isinstance(data, unicode) else data.decode('utf-8'))
 
     def dumps(self, data):
-        return yaml.dump(data)
+        return self._dump(data)
+
+
+class MsgpackSerializer(BaseSerializer):
+
+    content_types = ["application/msgpack", "application/x-msgpack"]
+    key = "msgpack"
+    suffixes = ("msgpack",)
+    requires = ("msgpack",)
+
+    def __init__(self):
+        msgpack = _import("msgpack")
+        self._unpackb, self._packb = msgpack.unpackb, msgpack.packb
+
+    def loads(self, data):
+        return self._unpackb(data, raw=False)
+
+    def dumps(self, data):
+        return self._packb(data, use_bin_type=True)
+
+
+_DEFAULT_SERIALIZERS = [JsonSerializer, NdjsonSerializer, YamlSerializer, MsgpackSerializer]
+
+
+def register_serializer(serializer_class):
+    """
+    Adds a serializer to the ones every new Serializer() starts with. Returns
+    the class, so that it can be used as a decorator.
+    """
+    _DEFAULT_SERIALIZERS.append(serializer_class)
+    return serializer_class
+
+
+class _SerializerDict(MutableMapping):
+    """
+    The available serializers by key. Registered classes are listed, and
+    created, importing their libraries, the first time their key is looked
+    up.
+    """
+
+    def __init__(self):
+        self.instances = {}
+        self.classes = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return self.instances, self.classes
+
+    def __setstate__(self, state):
+        self.instances, self.classes = state
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        try:
+            return self.instances[key]
+        except KeyError:
+            pass
+        with self._lock:
+            # Another thread may have created it meanwhile.
+            serializer = self.instances.get(key)
+            if serializer is not None:
+                return serializer
+            serializer_class = self.classes.get(key)
+            if serializer_class is None or not all(_import(name) is not None for name in serializer_class.requires):
+                raise KeyError(key)
+            serializer = self.instances[key] = serializer_class()
+            del self.classes[key]
+            return serializer
+
+    def __setitem__(self, key, serializer):
+        with self._lock:
+            self.classes.pop(key, None)
+            self.instances[key] = serializer
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self.instances and key not in self.classes:
+                raise KeyError(key)
+            self.instances.pop(key, None)
+            self.classes.pop(key, None)
+
+    def __iter__(self):
+        for key in list(self.instances):
+            yield key
+        for key, serializer_class in list(self.classes.items()):
+            if serializer_class.is_available():
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key in self.instances:
+            return True
+        serializer_class = self.classes.get(key)
+        return serializer_class is not None and serializer_class.is_available()
+
+    def set_class(self, key, serializer_class):
+        with self._lock:
+            self.instances.pop(key, None)
+            self.classes[key] = serializer_class
 
 
 class Serializer(object):
+    """
+    Picks a serializer by name or content type. Serializer classes are only
+    created, and their libraries imported, the first time they are used.
+
+    ``serializers`` maps the keys of the available serializers to them,
+    creating them as they are looked up.
+    """
 
     def __init__(self, default=None, serializers=None):
         if default is None:
-            default = "json" if _SERIALIZERS["json"] else "yaml"
+            default = "json" if JsonSerializer.is_available() else "yaml"
 
         if serializers is None:
-            serializers = [x() for x in [JsonSerializer, YamlSerializer] if _SERIALIZERS[x.key]]
+            serializers = _DEFAULT_SERIALIZERS
 
-        if not serializers:
+        if not any(not isinstance(x, type) or x.is_available() for x in serializers):
             raise exceptions.SerializerNoAvailable("There are no Available Serializers.")
 
-        self.serializers = {}
+        self.serializers = _SerializerDict()
+        # Keys of the serializers handling a content type or a suffix, the
+        # first available one is used.
+        self._content_types = {}
+        self._suffixes = {}
+        # Key of the serializer found for a Content-Type header value.
+        self._found = {}
 
         for serializer in serializers:
-            self.serializers[serializer.key] = serializer
+            self.register(serializer)
 
         self.default = default
 
+    def register(self, serializer):
+        """
+        Adds a serializer instance, or a class created when first needed if
+        its libraries are installed. Content types already handled by a
+        previously registered serializer keep going to it.
+        """
+        if isinstance(serializer, type):
+            self.serializers.set_class(serializer.key, serializer)
+        else:
+            self.serializers[serializer.key] = serializer
+        self._found = {}
+        for ctype in serializer.content_types or ():
+            keys = self._content_types.setdefault(ctype.lower(), [])
+            if serializer.key not in keys:
+                keys.append(serializer.key)
+        for suffix in getattr(serializer, "suffixes", ()):
+            keys = self._suffixes.setdefault(suffix.lower(), [])
+            if serializer.key not in keys:
+                keys.append(serializer.key)
+
+    def _load(self, key):
+        """
+        Returns the serializer registered as ``key``, None if there is none or
+        its libraries are missing.
+        """
+        serializer = self.serializers.instances.get(key)
+        if serializer is not None:
+            return serializer
+        try:
+            return self.serializers[key]
+        except KeyError:
+            return None
+
+    def _find(self, keys):
+        for key in keys or ():
+            serializer = self._load(key)
+            if serializer is not None:
+                return serializer
+        return None
+
     def get_serializer(self, name=None, content_type=None):
-        if name is None and content_type is None:
-            return self.serializers[self.default]
-        elif name is not None and content_type is None:
-            if not name in self.serializers:
+        if content_type is None:
+            if name is None:
+                name = self.default
+            serializer = self.serializers.instances.get(name) or self._load(name)
+            if serializer is None:
                 raise exceptions.SerializerNotAvailable("%s is not an available serializer" % name)
-            return self.serializers[name]
+            return serializer
         else:
-            for x in self.serializers.values():
-                for ctype in x.content_types:
-                    if content_type == ctype:
-                        return x
-            raise exceptions.SerializerNotAvailable("%s is not an available serializer" % content_type)
+            serializer = self.serializers.instances.get(self._found.get(content_type))
+            if serializer is not None:
+                return serializer
+            ctype = content_type.split(";", 1)[0].strip().lower()
+            serializer = self._find(self._content_types.get(ctype))
+            if serializer is None and "+" in ctype:
+                serializer = self._find(self._suffixes.get(ctype.rsplit("+", 1)[1]))
+            if serializer is None:
+                # Serializers set in the dict rather than registered.
+                serializer = next((x for x in list(self.serializers.instances.values())
+                                   if ctype in (x.content_types or ())), None)
+            if serializer is None:
+                raise exceptions.SerializerNotAvailable("%s is not an available serializer" % content_type)
+            if len(self._found) < 256 and self.serializers.instances.get(serializer.key) is serializer:
+                self._found[content_type] = serializer.key
+            return serializer
 
     def loads(self, data, format=None):
         s = self.get_serializer(format)
@@ -108,6 +453,10 @@ class Serializer(object):
         s = self.get_serializer(format)
         return s.dumps(data)
 
+    def dump_iter(self, items, format=None):
+        s = self.get_serializer(format)
+        return s.dump_iter(items)
+
     def get_content_type(self, format=None):
         s = self.get_serializer(format)
         return s.get_content_type()
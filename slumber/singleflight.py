@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+
+from .retry import Counters
+
+__all__ = ["SingleFlight"]
+
+
+class _Call(object):
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(Counters):
+    """
+    Runs a single call at a time per key: callers arriving while a call for
+    the same key is in flight wait for it and get its result, or its
+    exception, instead of making their own.
+    """
+
+    counters = ("calls", "coalesced")
+
+    def __init__(self):
+        super(SingleFlight, self).__init__()
+        self._calls = {}
+
+    def __getstate__(self):
+        state = super(SingleFlight, self).__getstate__()
+        state["_calls"] = {}
+        return state
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import codecs, json
+
+__all__ = ["iter_json_array"]
+
+_WHITESPACE = " \t\n\r"
+_NUMBER = "0123456789+-.eE"
+
+
+class JsonArrayReader(object):
+    """
+    Incremental reader yielding the elements of a JSON array one at a time
+    from an iterable of byte chunks.
+
+    Only the element being decoded and the current chunk are held in memory.
+    The values of the keys leading to the array are skipped without being
+    decoded.
+    """
+
+    def __init__(self, chunks, encoding="utf-8"):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder(encoding)("strict")
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Appends the next chunk to the buffer, returns False when the stream
+        is exhausted.
+        """
+        while not self.eof:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.eof = True
+                chunk = self.decoder.decode(b"", final=True)
+            else:
+                chunk = self.decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def grow(self):
+        """
+        Reads chunks until the unconsumed part of the buffer doubled, so that
+        decoding a large value is retried a logarithmic number of times.
+        """
+        target = 2 * (len(self.buffer) - self.pos)
+        grown = False
+        while self.fill():
+            grown = True
+            if len(self.buffer) - self.pos >= target:
+                break
+        return grown
+
+    def peek(self):
+        """
+        Returns the next non whitespace character without consuming it.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON data")
+
+    def expect(self, chars):
+        c = self.peek()
+        if c not in chars:
+            raise ValueError("Expected %r at position %d, got %r" % (chars, self.pos, c))
+        self.pos += 1
+        return c
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self.grow():
+                    raise
+                continue
+            # A number may go on in the next chunk.
+            if (end == len(self.buffer) or self.buffer[end] in _NUMBER) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self):
+        """
+        Consumes a value without decoding it.
+        """
+        if self.peek() not in "[{":
+            self.decode()
+            return
+
+        depth, in_string, escaped = 0, False, False
+        while True:
+            if self.pos >= len(self.buffer) and not self.fill():
+                raise ValueError("Unexpected end of JSON data")
+            c = self.buffer[self.pos]
+            self.pos += 1
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c in "[{":
+                depth += 1
+            elif c in "]}":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def seek(self, key):
+        """
+        Moves to the value of ``key`` in the object starting at the current
+        position.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            raise KeyError(key)
+        while True:
+            name = self.decode()
+            self.expect(":")
+            if name == key:
+                return
+            self.skip()
+            if self.expect(",}") == "}":
+                raise KeyError(key)
+
+    def items(self, path=()):
+        for key in path:
+            self.seek(key)
+
+        self.expect("[")
+        if self.peek() == "]":
+            return
+        while True:
+            yield self.decode()
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_json_array(chunks, path=None, encoding="utf-8"):
+    """
+    Yields the elements of the JSON array found at ``path``, a sequence of
+    object keys or a dotted string such as "meta.objects". The document
+    itself must be the array when ``path`` is empty.
+    """
+    if isinstance(path, basestring):
+        path = path.split(".")
+    return JsonArrayReader(chunks, encoding=encoding).items(path or ())
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Transports send the requests of a Resource. Anything with the ``request``
+method of requests.Session is one, and the API session is used when no
+transport is given.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import base64, collections, datetime, gzip, hashlib, io, json, os, threading, time, urllib
+
+import requests, urllib3
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, stream_decode_response_unicode
+
+from . import exceptions
+
+__all__ = ["Transport", "Urllib3Transport", "RecordingTransport", "ReplayTransport"]
+
+# Request headers not written to recordings.
+_REDACTED_HEADERS = frozenset(["authorization", "cookie", "proxy-authorization"])
+# Response headers describing the body as it was on the wire, not as recorded.
+_WIRE_HEADERS = frozenset(["content-encoding", "content-length", "transfer-encoding"])
+
+
+def _full_url(method, url, params):
+    return requests.Request(method, url, params=params).prepare().url
+
+
+def _encode_params(params):
+    """
+    Encodes query parameters like requests: None values are left out and
+    lists give repeated parameters.
+    """
+    pairs = []
+    for key, value in params.items():
+        for v in (value if isinstance(value, (list, tuple)) else [value]):
+            if v is not None:
+                pairs.append((key.encode("utf-8") if isinstance(key, unicode) else key,
+                              v.encode("utf-8") if isinstance(v, unicode) else v))
+    return urllib.urlencode(pairs)
+
+
+def _read_chunks(fp, chunk_size=64 * 1024):
+    return iter(lambda: fp.read(chunk_size), b"")
+
+
+def _body_digest(data):
+    if isinstance(data, unicode):
+        data = data.encode("utf-8")
+    return hashlib.sha1(data).hexdigest() if isinstance(data, bytes) else None
+
+
+def _encode_body(content):
+    try:
+        return content.decode("utf-8"), None
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return io.open(path, mode)
+
+
+class Transport(object):
+    """
+    Base class of the transports shipped with slumber.
+    """
+
+    def bind(self, session):
+        """
+        Called by API with its session, which transports sending requests
+        through requests use unless they were given one.
+        """
+
+    def request(self, method, url, data=None, params=None, files=None, headers=None, **kwargs):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class Urllib3Transport(Transport):
+    """
+    Sends requests straight to a urllib3 pool manager, skipping the work
+    requests.Session does for every request (hooks, cookies, proxies from the
+    environment, prepared requests), which dominates the client CPU time of
+    small requests.
+
+    Basic auth and the auth callables set on the API, such as requests auth
+    objects, are applied, redirects are followed, and connection errors and
+    timeouts are raised as the requests exceptions, so retries work the same.
+    Cookies and proxies are not supported, nor are auth objects answering
+    challenges through response hooks, such as HTTPDigestAuth, which raise
+    ImproperlyConfigured.
+
+    A forked process, or one the transport is pickled to, opens its own
+    connections.
+    """
+
+    def __init__(self, num_pools=10, maxsize=10, block=False, timeout=None, max_redirects=30, **pool_kwargs):
+        self.pool_options = dict(pool_kwargs, num_pools=num_pools, maxsize=maxsize, block=block)
+        self.poolmanager, self._pid = urllib3.PoolManager(**self.pool_options), os.getpid()
+        self.timeout = timeout
+        self.retries = urllib3.Retry(total=None, connect=0, read=0, status=0, redirect=max_redirects,
+                                     raise_on_redirect=False)
+        self.auth = self.authorization = None
+        self.headers = {}
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["poolmanager"], state["_pid"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.poolmanager, self._pid = urllib3.PoolManager(**self.pool_options), os.getpid()
+
+    def get_poolmanager(self):
+        """
+        Returns the pool manager of this process, the connections of the
+        parent are left alone after a fork.
+        """
+        if self._pid != os.getpid():
+            self.poolmanager, self._pid = urllib3.PoolManager(**self.pool_options), os.getpid()
+        return self.poolmanager
+
+    def bind(self, session):
+        # Sent with every request, like the session does.
+        self.headers = dict(getattr(session, "headers", None) or {})
+        auth = getattr(session, "auth", None)
+        if isinstance(auth, tuple):
+            # Computed once rather than for every request.
+            prepared = requests.PreparedRequest()
+            prepared.prepare_headers(None)
+            self.authorization = requests.auth.HTTPBasicAuth(*auth)(prepared).headers["Authorization"]
+        elif auth is not None and not callable(auth):
+            raise exceptions.ImproperlyConfigured("Urllib3Transport can't apply the auth %r" % (auth,))
+        else:
+            self.auth = auth
+
+    def request(self, method, url, data=None, params=None, files=None, headers=None, stream=False, timeout=None,
+                **kwargs):
+        merged = CaseInsensitiveDict(self.headers)
+        merged.update(headers or {})
+        # None removes a session header, as with requests.
+        headers = dict((k, v) for k, v in merged.items() if v is not None)
+        if params:
+            query = _encode_params(params)
+            if query:
+                url = "%s%s%s" % (url, "&" if "?" in url else "?", query)
+
+        if files:
+            prepared = requests.PreparedRequest()
+            prepared.prepare_headers(None)
+            prepared.prepare_body(data, files)
+            data, headers["content-type"] = prepared.body, prepared.headers["Content-Type"]
+        elif isinstance(data, dict):
+            data, headers["content-type"] = _encode_params(data), "application/x-www-form-urlencoded"
+        elif hasattr(data, "read"):
+            data = _read_chunks(data)
+
+        if self.authorization is not None:
+            headers.setdefault("Authorization", self.authorization)
+        elif self.auth is not None:
+            prepared = requests.PreparedRequest()
+            # Auth signing requests needs the body, unless it is streamed.
+            prepared.prepare(method=method, url=url, headers=headers,
+                             data=data if isinstance(data, (bytes, unicode)) else None)
+            prepared = self.auth(prepared)
+            if any(prepared.hooks.values()):
+                raise exceptions.ImproperlyConfigured("Urllib3Transport doesn't run the response hooks of %r"
+                                                      % (self.auth,))
+            url, headers = prepared.url, dict(prepared.headers)
+            # Set by prepare for a request without a body.
+            headers.pop("Content-Length", None)
+
+        options = {"chunked": data is not None and not isinstance(data, (bytes, unicode))}
+        timeout = timeout or self.timeout
+        if timeout:
+            # requests style (connect, read) tuples.
+            if isinstance(timeout, tuple):
+                timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+            options["timeout"] = timeout
+        started = time.time()
+        try:
+            raw = self.get_poolmanager().urlopen(method, url, body=data, headers=headers, retries=self.retries,
+                                                 preload_content=not stream, decode_content=True, **options)
+        except urllib3.exceptions.MaxRetryError as e:
+            # Failing to connect is a TimeoutError for urllib3.
+            if isinstance(e.reason, urllib3.exceptions.TimeoutError) and \
+                    not isinstance(e.reason, urllib3.exceptions.NewConnectionError):
+                raise requests.Timeout(e)
+            raise requests.ConnectionError(e)
+        except urllib3.exceptions.TimeoutError as e:
+            raise requests.Timeout(e)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.ConnectionError(e)
+
+        response = requests.Response()
+        response.status_code = raw.status
+        response.reason = raw.reason
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response.raw = raw
+        response.elapsed = datetime.timedelta(seconds=time.time() - started)
+        if not stream:
+            response._content, response._content_consumed = raw.data, True
+        return response
+
+    def close(self):
+        self.poolmanager.clear()
+
+
+class RecordingTransport(Transport):
+    """
+    Sends the requests through ``transport`` (the API session by default)
+    and appends every request and response, with its latency, as a line of
+    JSON to the file at ``path``, gzipped if it ends with ".gz".
+
+    Streamed responses are recorded as their body is read. One read in part,
+    as by ``iter_items``, is read to the end when it is closed, and one never
+    read is not recorded.
+
+    Once pickled, the transport appends to the file at the same path.
+    """
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport
+        self._file = _open(path, "ab")
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return self.path, self.transport
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def bind(self, session):
+        if self.transport is None:
+            self.transport = session
+
+    def request(self, method, url, data=None, params=None, files=None, headers=None, **kwargs):
+        started = time.time()
+        response = self.transport.request(method, url, data=data, params=params, files=files, headers=headers,
+                                          **kwargs)
+        elapsed = time.time() - started
+        exchange = {
+            "method": method,
+            "url": _full_url(method, url, params),
+            "request_headers": dict((k, v) for k, v in (headers or {}).items()
+                                    if k.lower() not in _REDACTED_HEADERS),
+            "request_digest": _body_digest(data),
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict((k, v) for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS),
+            "elapsed": elapsed,
+        }
+        if kwargs.get("stream"):
+            self.tee(response, exchange)
+        else:
+            self.write(exchange, response.content)
+        return response
+
+    def tee(self, response, exchange):
+        """
+        Records ``exchange`` with the body of ``response`` as it is read.
+        """
+        iter_content, close = response.iter_content, response.close
+        reads = []
+
+        def read(chunk_size):
+            chunks = []
+            for chunk in iter_content(chunk_size):
+                chunks.append(chunk)
+                yield chunk
+            self.write(exchange, b"".join(chunks))
+
+        def tee(chunk_size=1, decode_unicode=False):
+            # Only the first read can see the whole body.
+            response.iter_content = iter_content
+            reads.append(read(chunk_size))
+            return stream_decode_response_unicode(reads[0], response) if decode_unicode else reads[0]
+
+        def finish():
+            response.close = close
+            try:
+                for chunks in reads:
+                    collections.deque(chunks, maxlen=0)
+            except requests.RequestException:
+                pass
+            close()
+
+        # Also used by Response.content and iter_lines.
+        response.iter_content, response.close = tee, finish
+
+    def write(self, exchange, content):
+        exchange["body"], exchange["body_encoding"] = _encode_body(content or b"")
+        line = (json.dumps(exchange, sort_keys=True) + "\n").encode("utf-8")
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests with the responses of a recording made by
+    RecordingTransport, matched on method, URL with its query string and
+    body. Identical requests get the recorded responses in turn, the last
+    one being repeated.
+
+    ``latency`` scales the recorded latency: 1 waits as long as the
+    recorded request took, 0 (the default) answers right away.
+
+    Once pickled, the transport loads the recording from ``path`` again and
+    serves its responses from the start.
+    """
+
+    def __init__(self, path, latency=0):
+        self.path = path
+        self.latency = latency
+        self._exchanges = collections.defaultdict(list)
+        self._served = collections.defaultdict(int)
+        self._lock = threading.Lock()
+        with _open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    exchange = json.loads(line.decode("utf-8"))
+                    key = (exchange["method"], exchange["url"], exchange["request_digest"])
+                    self._exchanges[key].append(exchange)
+
+    def __getstate__(self):
+        return self.path, self.latency
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def request(self, method, url, data=None, params=None, files=None, headers=None, **kwargs):
+        key = (method, _full_url(method, url, params), _body_digest(data))
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise exceptions.ReplayMissError("No recorded response for %s %s" % (method, key[1]))
+            exchange = exchanges[min(self._served[key], len(exchanges) - 1)]
+            self._served[key] += 1
+
+        if self.latency:
+            time.sleep(exchange["elapsed"] * self.latency)
+        return self.get_response(exchange)
+
+    def get_response(self, exchange):
+        response = requests.Response()
+        response.status_code = exchange["status_code"]
+        response.reason = exchange["reason"]
+        response.url = exchange["url"]
+        response.headers = CaseInsensitiveDict(exchange["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = datetime.timedelta(seconds=exchange["elapsed"])
+        body = exchange["body"].encode("utf-8") if exchange["body_encoding"] is None else \
+            base64.b64decode(exchange["body"])
+        # Served from memory, iter_content included.
+        response._content, response._content_consumed = body, True
+        return response
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, mock, sys, threading, unittest
+import slumber, slumber.auth, slumber.serialize
+
+aio = None
+if sys.version_info >= (3, 5):
+    import asyncio
+    from slumber import aio
+
+
+def run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+@unittest.skipIf(aio is None or aio.aiohttp is None, "asyncio and aiohttp are required.")
+class AsyncResourceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = aio.AsyncAPI(base_url="http://example/api/v1/", append_slash=False)
+        self.session = mock.MagicMock()
+        self.api._store["session"]._session = self.session
+        self.session.closed = False
+
+    def mock_response(self, status, content, headers=None):
+        r = mock.MagicMock()
+        r.status = status
+        r.reason = "Reason"
+        r.url = "http://example/api/v1/test"
+        r.charset = None
+        r.headers = headers or {}
+        r.read = mock.AsyncMock(return_value=content)
+        self.session.request.return_value.__aenter__.return_value = r
+        return r
+
+    def test_navigation(self):
+        resource = self.api.test(1).child
+        self.assertTrue(isinstance(resource, aio.AsyncResource))
+        self.assertEqual(resource._store["base_url"], "http://example/api/v1/test/1/child")
+
+    def test_get_200_json(self):
+        self.mock_response(200, b'{"result": ["a", "b", "c"]}', {"content-type": "application/json"})
+
+        response = run(self.api.test.get(limit=10, offset=None))
+        self.assertEqual(response["result"], ["a", "b", "c"])
+
+        s = self.api._store["serializer"]
+        self.session.request.assert_called_once_with(
+            "GET",
+            "http://example/api/v1/test",
+            data=None,
+            params={"limit": 10},
+            headers={"content-type": s.get_content_type(), "accept": s.get_content_type()}
+        )
+
+    def test_post_token_and_body(self):
+        self.mock_response(201, b"", {})
+        self.api._store["token"] = {"token_type": "Bearer", "access_token": "abc"}
+
+        run(self.api.test.post({"foo": "bar"}))
+
+        kwargs = self.session.request.call_args[1]
+        self.assertEqual(json.loads(kwargs["data"]), {"foo": "bar"})
+        self.assertEqual(kwargs["headers"]["Authorization"], "Bearer abc")
+
+    def test_errors(self):
+        self.mock_response(404, b"Not Found")
+        self.assertRaises(slumber.exceptions.HttpClientError, run, self.api.test.get())
+
+        self.mock_response(503, b"Unavailable")
+        self.assertRaises(slumber.exceptions.HttpServerError, run, self.api.test.delete())
+
+    def test_response_hook(self):
+        self.mock_response(200, b'{"foo": "bar"}', {"content-type": "application/json"})
+        self.api._store["response_hook"] = lambda resource, content: (resource, content)
+
+        resource, content = run(self.api.test.get())
+        self.assertTrue(isinstance(resource, aio.AsyncResource))
+        self.assertEqual(content, {"foo": "bar"})
+
+    def test_sync_helpers(self):
+        self.assertRaises(NotImplementedError, self.api.test.iter_items)
+        self.assertRaises(NotImplementedError, self.api.test.get_many, [1, 2])
+        self.assertRaises(NotImplementedError, self.api.pool_stats)
+        self.assertRaises(NotImplementedError, self.api.add_listener, mock.Mock())
+        self.assertFalse(self.session.request.called)
+
+    def test_token_refresh(self):
+        self.mock_response(204, b"")
+        threads = []
+
+        class Provider(slumber.auth.TokenProvider):
+            def fetch_token(self):
+                threads.append(threading.current_thread())
+                return {"token_type": "Bearer", "access_token": "new", "expires_in": 3600}
+
+        self.api._store["token"] = Provider(token={"token_type": "Bearer", "access_token": "old", "expires_in": 0})
+        run(self.api.test.delete())
+
+        self.assertEqual(self.session.request.call_args[1]["headers"]["Authorization"], "Bearer new")
+        self.assertTrue(threads[0] is not threading.current_thread())
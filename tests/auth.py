@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import mock, threading, time, unittest, requests
+import slumber, slumber.auth
+
+
+class FakeProvider(slumber.auth.TokenProvider):
+
+    def __init__(self, **kwargs):
+        self.fetched = 0
+        self.release = threading.Event()
+        self.release.set()
+        super(FakeProvider, self).__init__(**kwargs)
+
+    def fetch_token(self):
+        self.release.wait()
+        self.fetched += 1
+        return {"token_type": "Bearer", "access_token": "token%d" % self.fetched, "expires_in": 3600}
+
+
+class TokenProviderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("slumber.auth.time.time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.provider = FakeProvider(token={"token_type": "Bearer", "access_token": "token0", "expires_in": 600})
+
+    def wait_for(self, condition):
+        for _ in range(100):
+            if condition():
+                return
+            time.sleep(0.01)
+        self.fail("Timed out")
+
+    def test_header(self):
+        session = mock.Mock(spec=requests.Session)
+        session.request.return_value = mock.Mock(spec=requests.Response, status_code=204, headers={})
+        api = slumber.API("http://example/api/v1/", session=session, token=self.provider)
+
+        api.test.delete()
+        self.assertEqual(session.request.call_args[1]["headers"]["Authorization"], "Bearer token0")
+        self.assertEqual(self.provider.fetched, 0)
+
+    def test_background_refresh(self):
+        self.now += 545
+        self.assertEqual(self.provider.get_header(), "Bearer token0")
+
+        self.wait_for(lambda: self.provider.background_refreshes == 1)
+        self.assertEqual(self.provider.get_header(), "Bearer token1")
+        self.assertEqual(self.provider.fetched, 1)
+
+    def test_failed_background_refresh(self):
+        self.provider.fetch_token = mock.Mock(side_effect=requests.ConnectionError())
+        self.now += 545
+        self.assertEqual(self.provider.get_header(), "Bearer token0")
+
+        self.wait_for(lambda: self.provider.failures == 1 and not self.provider._refreshing)
+        self.assertEqual(self.provider.get_header(), "Bearer token0")
+        self.assertEqual(self.provider.fetch_token.call_count, 1)
+
+    def test_expired(self):
+        self.now += 600
+        self.provider.release.clear()
+        headers = []
+
+        def get_header():
+            headers.append(self.provider.get_header())
+        threads = [threading.Thread(target=get_header) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        self.wait_for(lambda: self.provider._flight.coalesced == 4)
+        self.provider.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(headers, ["Bearer token1"] * 5)
+        self.assertEqual(self.provider.fetched, 1)
+
+    def test_invalidate(self):
+        self.provider.invalidate()
+        self.assertEqual(self.provider.get_header(), "Bearer token1")
+
+    def test_identity(self):
+        identity = self.provider.identity
+        self.assertFalse(self.provider.is_expired())
+        self.now += 600
+        self.assertTrue(self.provider.is_expired())
+        self.provider.get_header()
+        self.assertEqual(self.provider.identity, identity)
+        self.assertNotEqual(FakeProvider().identity, identity)
+
+
+class OAuth2TokenProviderTestCase(unittest.TestCase):
+
+    def test_fetch_token(self):
+        provider = slumber.auth.OAuth2TokenProvider("http://example/token", client_id="id", client_secret="secret",
+                                                    scope="read")
+        response = mock.Mock(spec=requests.Response, status_code=200)
+        response.json.return_value = {"token_type": "Bearer", "access_token": "a", "refresh_token": "r",
+                                      "expires_in": 60}
+
+        with mock.patch("slumber.auth.requests.post", return_value=response) as post:
+            self.assertEqual(provider.get_header(), "Bearer a")
+            self.assertEqual(post.call_args[1]["data"], {"grant_type": "client_credentials", "scope": "read"})
+            self.assertEqual(post.call_args[1]["auth"], ("id", "secret"))
+
+            response.json.return_value = {"token_type": "Bearer", "access_token": "b", "expires_in": 60}
+            provider.invalidate()
+            self.assertEqual(provider.get_header(), "Bearer b")
+            self.assertEqual(post.call_args[1]["data"]["refresh_token"], "r")
+            self.assertEqual(provider.token["refresh_token"], "r")
+
+    def test_identity(self):
+        alice, bob = [slumber.auth.OAuth2TokenProvider("http://example/token", token={
+            "access_token": "a", "refresh_token": user, "expires_in": 60}) for user in ("alice", "bob")]
+        self.assertNotEqual(alice.identity, bob.identity)
+        alice.set_token({"access_token": "b", "refresh_token": "rotated", "expires_in": 60})
+        self.assertEqual(alice.identity, "http://example/token None None alice")
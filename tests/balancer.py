@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import mock, unittest, requests
+import slumber, slumber.balancer, slumber.retry
+import mocks
+
+
+class LoadBalancerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.balancer = slumber.balancer.LoadBalancer(["http://a/api/v1/", "http://b/api/v1/"], max_failures=2,
+                                                      ejection_time=30)
+        self.api = slumber.API(base_urls=self.balancer, session=mock.Mock(spec=requests.Session))
+        self.session = self.api._store["session"]
+        self.down = set()
+
+        def request(method, url, **kwargs):
+            if url.split("/")[2] in self.down:
+                raise requests.ConnectionError()
+            return mocks.response()
+        self.session.request.side_effect = request
+
+    def hosts(self):
+        return [call[0][1].split("/")[2] for call in self.session.request.call_args_list]
+
+    def test_round_robin(self):
+        self.api.test(1).get()
+        self.api.test(1).other.get()
+        self.assertEqual(self.hosts(), ["a", "b"])
+        self.assertEqual(self.session.request.call_args[0][1], "http://b/api/v1/test/1/other/")
+        self.assertEqual(self.api._store.base_url, "http://a/api/v1/")
+
+    def test_ejection(self):
+        self.down.add("b")
+        for _ in range(5):
+            try:
+                self.api.test.get()
+            except requests.ConnectionError:
+                pass
+        self.assertEqual(self.hosts(), ["a", "b", "a", "b", "a"])
+        self.assertEqual(self.balancer.ejections, 1)
+        self.assertFalse(self.balancer.stats()["origins"]["http://b/api/v1/"]["available"])
+
+        # Probed back in once the ejection is over.
+        self.down.clear()
+        with mock.patch("slumber.balancer.time.time", return_value=self.balancer.origins[1].ejected_until):
+            self.api.test.get()
+        self.api.test.get()
+        self.assertEqual(self.hosts()[5:], ["b", "a"])
+        self.assertEqual(self.balancer.probes, 1)
+        self.assertTrue(self.balancer.stats()["origins"]["http://b/api/v1/"]["available"])
+
+    def test_server_errors(self):
+        self.session.request.side_effect = None
+        self.session.request.return_value = mocks.response(503)
+        for _ in range(4):
+            self.assertRaises(slumber.exceptions.HttpServerError, self.api.test.get)
+        self.assertEqual((self.balancer.failures, self.balancer.ejections), (4, 2))
+
+    def test_circuit_breaker(self):
+        breaker = slumber.retry.CircuitBreaker(failure_threshold=2)
+        balancer = slumber.balancer.LoadBalancer(["http://a/api/v1/", "http://b/api/v1/"], max_failures=10)
+        api = slumber.API(base_urls=balancer, session=self.session, circuit_breaker=breaker)
+        self.down.add("b")
+        for _ in range(6):
+            try:
+                api.test.get()
+            except (requests.ConnectionError, slumber.exceptions.CircuitOpenError):
+                pass
+
+        # Only the circuit of the failing origin opens.
+        self.assertEqual((breaker.get_state("a"), breaker.get_state("b")), ("closed", "open"))
+        self.assertEqual(self.hosts(), ["a", "b", "a", "b", "a"])
+        self.assertEqual(balancer.failures, 3)
+
+    def test_strategies(self):
+        origins = [slumber.balancer.Origin("a"), slumber.balancer.Origin("b")]
+        origins[0].outstanding, origins[0].latency = 1, 0.1
+        origins[1].outstanding, origins[1].latency = 3, 0.02
+        self.assertEqual(slumber.balancer.LeastOutstanding().choose(origins).url, "a")
+        self.assertEqual(slumber.balancer.Ewma().choose(origins).url, "b")
+
+    def test_base_urls(self):
+        api = slumber.API(base_urls=["http://a/", "http://b/"], session=self.session)
+        self.assertEqual(api._store["balancer"].base_url, "http://a/")
+        self.assertRaises(slumber.exceptions.ImproperlyConfigured, slumber.API, "http://a/", base_urls=["http://b/"])
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, mock, unittest, requests
+import slumber, slumber.bulk
+
+
+class BulkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session))
+        self.session = self.api._store["session"]
+        self.produced = 0
+        self.sent = []
+
+        def request(method, url, data=None, **kwargs):
+            payload = json.loads(data)
+            self.sent.append((method, payload, self.produced))
+            r = mock.Mock(spec=requests.Response)
+            r.status_code = 400 if payload == [{"id": 4}] else 201
+            r.reason, r.url, r.text = "Reason", url, ""
+            r.headers = {"content-type": "application/json"}
+            r.content = json.dumps({"created": len(payload)})
+            return r
+        self.session.request.side_effect = request
+
+    def records(self, count):
+        for i in range(count):
+            self.produced += 1
+            yield {"id": i}
+
+    def test_bulk_create(self):
+        report = self.api.items.bulk_create(self.records(5), chunk_size=2, concurrency=2)
+
+        self.assertEqual([chunk.size for chunk in report], [2, 2, 1])
+        self.assertEqual(report[0].result, {"created": 2})
+        self.assertEqual((report.succeeded, report.failed), (4, 1))
+        self.assertEqual(report.errors, [report[2]])
+        self.assertTrue(isinstance(report[2].error, slumber.exceptions.HttpClientError))
+        self.assertTrue([{"id": 0}, {"id": 1}] in [payload for _, payload, _ in self.sent])
+
+    def test_bulk_update(self):
+        report = self.api.items.bulk_update(self.records(3), chunk_size=3)
+
+        self.assertEqual(len(report), 1)
+        method, payload, _ = self.sent[0]
+        self.assertEqual((method, payload), ("PATCH", {"objects": [{"id": 0}, {"id": 1}, {"id": 2}]}))
+
+    def test_back_pressure(self):
+        self.api.items.bulk_create(self.records(100), chunk_size=10, concurrency=1, max_pending=2)
+
+        self.assertEqual(len(self.sent), 10)
+        for index, (_, _, produced) in enumerate(self.sent):
+            # Never more than the chunk being sent and the next one read.
+            self.assertTrue(produced <= (index + 2) * 10)
+
+    def test_chunked(self):
+        self.assertEqual(list(slumber.bulk.chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(slumber.bulk.chunked([], 2)), [])
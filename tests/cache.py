@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os, shutil, tempfile, unittest, requests
+import slumber, slumber.cache, slumber.serialize
+import mocks
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = slumber.cache.Cache()
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mocks.session(),
+                               append_slash=False, cache=self.cache)
+        self.session = self.api._store["session"]
+
+    def test_fresh_hit(self):
+        self.session.request.return_value = mocks.response(headers={"cache-control": "max-age=60"})
+
+        self.assertEqual(self.api.test.get(q=1), {"ok": True})
+        self.assertEqual(self.api.test.get(q=1), {"ok": True})
+        self.assertEqual(self.session.request.call_count, 1)
+
+        self.api.test.get(q=2)
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_revalidation(self):
+        self.session.request.side_effect = (
+            mocks.response(headers={"etag": '"v1"', "cache-control": "no-cache"}),
+            mocks.response(status_code=304, content=""),
+        )
+
+        first = self.api.test.get()
+        second = self.api.test.get()
+
+        self.assertTrue(first is second)
+        self.assertEqual(self.session.request.call_args[1]["headers"]["If-None-Match"], '"v1"')
+        self.assertEqual(self.cache.stats()["revalidations"], 1)
+
+    def test_no_store(self):
+        self.session.request.return_value = mocks.response(headers={"cache-control": "no-store, max-age=60"})
+
+        self.api.test.get()
+        self.api.test.get()
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
+        # A response that can't be stored drops the previous one.
+        self.session.request.return_value = mocks.response(headers={"etag": '"v1"', "cache-control": "no-cache"})
+        self.api.test.get()
+        self.session.request.return_value = mocks.response(content='{"result": 2}',
+                                                           headers={"cache-control": "no-store"})
+        self.assertEqual(self.api.test.get(), {"result": 2})
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+    def test_invalidation(self):
+        self.session.request.return_value = mocks.response(headers={"cache-control": "max-age=60"})
+        self.api.test.get()
+        self.api.test.get(page=2)
+        self.api.other.get()
+        self.assertEqual(len(self.cache), 3)
+
+        self.api.test.put({"foo": "bar"})
+        self.assertEqual(len(self.cache), 1)
+
+    def test_lru_eviction(self):
+        cache = slumber.cache.Cache(max_entries=2, max_size=20)
+        response = mocks.response(content="{}", headers={"cache-control": "max-age=60"})
+
+        for url in ("a", "b", "c"):
+            cache.set(cache.get_key(url), response, {})
+        self.assertEqual([k[0] for k in cache._entries], ["b", "c"])
+
+        cache.get(cache.get_key("b"))
+        cache.set(cache.get_key("d"), mocks.response(content="x" * 10, headers={"cache-control": "max-age=60"}), {})
+        self.assertEqual([k[0] for k in cache._entries], ["b", "d"])
+        self.assertEqual(cache.size, 12)
+
+        cache.set(cache.get_key("e"), mocks.response(content="x" * 15, headers={"cache-control": "max-age=60"}), {})
+        self.assertEqual([k[0] for k in cache._entries], ["e"])
+
+
+class DiskCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache.sqlite")
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mocks.session(),
+                               append_slash=False, cache=self.path)
+        self.cache = self.api._store["cache"]
+        self.session = self.api._store["session"]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared_hit(self):
+        self.session.request.return_value = mocks.response(headers={"cache-control": "max-age=60"})
+        self.assertEqual(self.api.test.get(q=1), {"ok": True})
+        self.assertEqual(self.api.test.get(q=1), {"ok": True})
+        self.assertEqual(self.session.request.call_count, 1)
+
+        # Another process using the same file.
+        other = slumber.API(base_url="http://example/api/v1/", session=mocks.session(),
+                            append_slash=False, cache=slumber.cache.DiskCache(self.path))
+        self.assertEqual(other.test.get(q=1), {"ok": True})
+        self.assertEqual(other._store["session"].request.call_count, 0)
+        self.assertEqual(other._store["cache"].stats()["entries"], 1)
+
+    def test_revalidation(self):
+        self.session.request.side_effect = (
+            mocks.response(headers={"etag": '"v1"', "cache-control": "no-cache"}),
+            mocks.response(status_code=304, content="", headers={"cache-control": "max-age=60"}),
+        )
+
+        self.assertEqual(self.api.test.get(), {"ok": True})
+        self.assertEqual(self.api.test.get(), {"ok": True})
+        self.assertEqual(self.session.request.call_args[1]["headers"]["If-None-Match"], '"v1"')
+        self.assertEqual(self.api.test.get(), {"ok": True})
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(self.cache.stats()["revalidations"], 1)
+
+    def test_auth_scope(self):
+        self.session.request.return_value = mocks.response(headers={"cache-control": "max-age=60"})
+        self.api.test.get()
+        self.session.auth = ("user", "pass")
+        self.api.test.get()
+        self.assertEqual(self.session.request.call_count, 2)
+
+        # Auth objects, headers and cookies are credentials too.
+        for auth in (requests.auth.HTTPBasicAuth("alice", "a"), requests.auth.HTTPBasicAuth("bob", "b")):
+            self.session.auth = auth
+            self.api.test.get()
+        self.session.headers["Authorization"] = "ApiKey bob:secret"
+        self.api.test.get()
+        self.session.cookies.set("sessionid", "bob")
+        self.api.test.get()
+        self.assertEqual(self.session.request.call_count, 6)
+
+        # Auth that can't be told apart isn't cached.
+        self.session.auth = lambda request: request
+        self.api.test.get()
+        self.api.test.get()
+        self.assertEqual(self.session.request.call_count, 8)
+
+        self.api.test.put({"foo": "bar"})
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        cache = slumber.cache.DiskCache(self.path, max_size=20)
+        response = mocks.response(content="x" * 8, headers={"cache-control": "max-age=60"})
+
+        for url in ("a", "b", "c"):
+            cache.set(cache.get_key(url), response, {})
+        self.assertEqual(cache.get(cache.get_key("a")), None)
+
+        cache.get(cache.get_key("b"))
+        cache.set(cache.get_key("d"), response, {})
+        self.assertEqual(cache.get(cache.get_key("c")), None)
+        self.assertEqual(cache.stats()["size"], 16)
+
+        cache.set(cache.get_key("e"), mocks.response(content="x" * 21, headers={"cache-control": "max-age=60"}), {})
+        self.assertEqual(cache.get(cache.get_key("e")), None)
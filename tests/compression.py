@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, mock, unittest, requests, zlib
+import slumber, slumber.compression
+
+
+class CompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session),
+                               compress_requests=True)
+        self.session = self.api._store["session"]
+        r = mock.Mock(spec=requests.Response)
+        r.status_code = 201
+        r.headers, r.content = {}, ""
+        self.session.request.return_value = r
+        self.payload = [{"id": i, "name": "item"} for i in range(200)]
+
+    def sent(self):
+        kwargs = self.session.request.call_args[1]
+        return kwargs["data"], kwargs["headers"]
+
+    def test_gzip(self):
+        self.api.items.post(self.payload)
+
+        data, headers = self.sent()
+        self.assertEqual(headers["content-encoding"], "gzip")
+        self.assertTrue(headers["accept-encoding"].startswith("gzip, deflate"))
+        self.assertEqual(json.loads(zlib.decompress(data, 16 + zlib.MAX_WBITS).decode("utf-8")), self.payload)
+
+        stats = self.api._store["compress_requests"].stats()
+        self.assertEqual((stats["compressed"], stats["skipped"], stats["bytes_out"]), (1, 0, len(data)))
+        self.assertTrue(stats["ratio"] < 0.2)
+
+    def test_cpu_time(self):
+        with mock.patch("slumber.compression._cpu_time", side_effect=[1.0, 1.25]):
+            self.api.items.post(self.payload)
+        self.assertEqual(self.api._store["compress_requests"].stats()["compress_time"], 0.25)
+
+    def test_deflate(self):
+        self.api._store["compress_requests"] = slumber.compression.RequestCompressor("deflate", level=9)
+        self.api.items.put(self.payload)
+
+        data, headers = self.sent()
+        self.assertEqual(headers["content-encoding"], "deflate")
+        self.assertEqual(json.loads(zlib.decompress(data).decode("utf-8")), self.payload)
+
+    def test_threshold(self):
+        self.api.items.post({"id": 1})
+
+        data, headers = self.sent()
+        self.assertFalse("content-encoding" in headers)
+        self.assertEqual(json.loads(data), {"id": 1})
+        self.assertEqual(self.api._store["compress_requests"].stats()["skipped"], 1)
+
+    def test_not_configured(self):
+        api = slumber.API(base_url="http://example/api/v1/", session=self.session)
+        api.items.post(self.payload)
+
+        data, headers = self.sent()
+        self.assertFalse("content-encoding" in headers or "accept-encoding" in headers)
+
+    def test_unsupported_encoding(self):
+        self.assertRaises(slumber.exceptions.ImproperlyConfigured, slumber.compression.RequestCompressor, "lzma")
+
+    def test_stream(self):
+        self.api.items.post(iter(self.payload))
+
+        data, headers = self.sent()
+        self.assertEqual(headers["content-encoding"], "gzip")
+        body = zlib.decompress(b"".join(data), 16 + zlib.MAX_WBITS)
+        self.assertEqual(json.loads(body.decode("utf-8")), self.payload)
+        self.assertEqual(self.api._store["compress_requests"].stats()["bytes_in"], len(body))
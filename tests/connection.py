@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import threading, unittest
+import BaseHTTPServer
+import slumber
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = "http://127.0.0.1:%d/api/" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_adapters(self):
+        api = slumber.API(self.url, pool_connections=4, pool_maxsize=32, pool_block=True, keepalive=False)
+        adapter = api._store["session"].get_adapter(self.url)
+
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_block, True)
+        self.assertEqual(api._store["session"].headers["Connection"], "close")
+
+    def test_pool_stats(self):
+        api = slumber.API(self.url)
+        for _ in range(4):
+            self.assertEqual(api.thing.get(), {"ok": True})
+
+        stats = api.pool_stats()["http://127.0.0.1:%d" % self.server.server_address[1]]
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(stats["idle"], 1)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["reuse_ratio"], 0.75)
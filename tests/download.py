@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import io, os, re, shutil, tempfile, threading, unittest
+import BaseHTTPServer, SocketServer
+import slumber, slumber.download
+
+DATA = bytes(bytearray(range(256))) * 1024
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        data, etag = self.server.data, self.server.etag
+        self.server.ranges.append(self.headers.get("Range"))
+        self.server.if_ranges.append(self.headers.get("If-Range"))
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match is None or self.path.startswith("/api/plain/") or self.headers.get("If-Range", etag) != etag:
+            self.send_response(200)
+            start, end = 0, len(data)
+        else:
+            start = int(match.group(1))
+            end = int(match.group(2)) + 1 if match.group(2) else len(data)
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */%d" % len(data))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes %d-%d/%d" % (start, end - 1, len(data)))
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data[start:end])
+
+    def log_message(self, *args):
+        pass
+
+
+class Interrupted(Exception):
+    pass
+
+
+class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+
+class DownloadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.ranges, self.server.if_ranges = [], []
+        self.server.data, self.server.etag = DATA, '"1"'
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        self.api = slumber.API("http://127.0.0.1:%d/api/" % self.server.server_address[1])
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "file.bin")
+
+    def tearDown(self):
+        self.api._store["session"].close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def read(self):
+        with io.open(self.path, "rb") as f:
+            return f.read()
+
+    def test_download(self):
+        progress = []
+        stats = self.api.file.download(self.path, chunk_size=64 * 1024, progress=lambda *args: progress.append(args))
+
+        self.assertEqual(self.read(), DATA)
+        self.assertEqual((stats["size"], stats["received"], stats["total"]), (len(DATA), len(DATA), len(DATA)))
+        self.assertTrue(stats["throughput"] > 0)
+        self.assertEqual(progress[-1], (len(DATA), len(DATA)))
+        self.assertEqual(self.server.ranges, [None])
+
+    def test_file_like(self):
+        buf = io.BytesIO()
+        self.api.file.download(buf, connections=4)
+        self.assertEqual(buf.getvalue(), DATA)
+
+    def interrupt(self, size=1000):
+        """
+        Stops a download after ``size`` bytes, leaving a partial file.
+        """
+        def progress(done, total):
+            raise Interrupted()
+        self.assertRaises(Interrupted, self.api.file.download, self.path, chunk_size=size, progress=progress)
+        self.assertEqual(len(self.read()), size)
+        self.server.ranges, self.server.if_ranges = [], []
+
+    def test_resume(self):
+        self.interrupt()
+
+        stats = self.api.file.download(self.path)
+        self.assertEqual(self.read(), DATA)
+        self.assertEqual(stats["received"], len(DATA) - 1000)
+        self.assertEqual((self.server.ranges, self.server.if_ranges), (["bytes=1000-"], ['"1"']))
+        self.assertFalse(os.path.exists(self.path + slumber.download.STATE_SUFFIX))
+
+        # A complete file, or one not written by download, is fetched again.
+        stats = self.api.file.download(self.path)
+        self.assertEqual((stats["size"], stats["received"]), (len(DATA), len(DATA)))
+        self.assertEqual(self.read(), DATA)
+        self.assertEqual(self.server.ranges, ["bytes=1000-", None])
+
+    def test_resume_changed(self):
+        self.interrupt()
+        self.server.data, self.server.etag = DATA[::-1], '"2"'
+
+        stats = self.api.file.download(self.path)
+        self.assertEqual(self.read(), DATA[::-1])
+        self.assertEqual(stats["received"], len(DATA))
+        self.assertEqual(self.server.ranges, ["bytes=1000-"])
+
+    def test_resume_larger(self):
+        self.interrupt()
+        with io.open(self.path, "ab") as f:
+            f.write(b"x" * len(DATA))
+
+        # The 416 doesn't mean the file is complete.
+        self.api.file.download(self.path)
+        self.assertEqual(self.read(), DATA)
+        self.assertEqual(self.server.ranges, ["bytes=%d-" % (len(DATA) + 1000), None])
+
+    def test_ranges_ignored(self):
+        with io.open(self.path, "wb") as f:
+            f.write(b"x" * 1000)
+
+        self.api.plain.download(self.path)
+        self.assertEqual(self.read(), DATA)
+
+    def test_parallel(self):
+        stats = self.api.file.download(self.path, chunk_size=16 * 1024, connections=4, memory_map=True)
+
+        self.assertEqual(self.read(), DATA)
+        self.assertEqual(stats["size"], len(DATA))
+        self.assertEqual(sorted(self.server.ranges),
+                         ["bytes=0-", "bytes=131072-196607", "bytes=196608-262143", "bytes=65536-131071"])
+
+        buf = bytearray(len(DATA))
+        self.api.file.download(buf, chunk_size=16 * 1024, connections=3)
+        self.assertEqual(bytes(buf), DATA)
+
+        self.assertRaises(slumber.exceptions.DownloadError, self.api.file.download, bytearray(), connections=8)
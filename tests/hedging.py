@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import itertools, mock, threading, unittest, requests
+import slumber, slumber.hedging
+import mocks
+
+
+class HedgingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = slumber.hedging.HedgePolicy(delay=0.01, max_ratio=1)
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session),
+                               hedge=self.policy)
+        self.session = self.api._store["session"]
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        calls = itertools.count()
+
+        def request(method, url, **kwargs):
+            # The first request hangs until the end of the test.
+            if next(calls) == 0:
+                self.release.wait()
+                return mocks.response(content='"slow"')
+            return mocks.response(content='"fast"')
+        self.session.request.side_effect = request
+
+    def test_hedge(self):
+        self.assertEqual(self.api.test.get(), "fast")
+        self.assertEqual(self.session.request.call_count, 2)
+
+        stats = self.policy.stats()
+        self.assertEqual((stats["requests"], stats["hedged"], stats["hedge_wins"]), (1, 1, 1))
+        self.assertEqual((stats["hedge_rate"], stats["win_rate"]), (1.0, 1.0))
+
+    def test_not_hedged(self):
+        self.release.set()
+        self.assertEqual(self.api.test.post({}), "slow")
+        self.assertEqual(self.api.test.get(), "fast")
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual(self.policy.hedged, 0)
+
+    def test_max_ratio(self):
+        self.policy.max_ratio = 0.4
+        self.session.request.side_effect = None
+        self.session.request.return_value = mocks.response(content='"ok"')
+        self.api.test.get()
+
+        def request(method, url, **kwargs):
+            self.release.wait()
+            return mocks.response(content='"slow"')
+        self.session.request.side_effect = request
+        threading.Timer(0.1, self.release.set).start()
+        self.assertEqual(self.api.test.get(), "slow")
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertEqual((self.policy.hedged, self.policy.capped), (0, 1))
+
+    def test_adaptive_delay(self):
+        policy = slumber.hedging.HedgePolicy(min_samples=10, initial_delay=0.5)
+        self.assertEqual(policy.get_delay("t"), 0.5)
+
+        for i in range(1, 101):
+            policy.record("t", i / 1000.0)
+        self.assertTrue(0.09 <= policy.get_delay("t") <= 0.1)
+        self.assertEqual(policy.get_delay("other"), 0.5)
+        self.assertTrue(0.09 <= policy.stats()["delays"]["t"] <= 0.1)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os, subprocess, sys, unittest
+import slumber
+
+# Time ``import slumber`` may take on top of importing requests, as a share
+# of the time importing requests takes, so that it holds on slow machines.
+IMPORT_BUDGET = float(os.environ.get("SLUMBER_IMPORT_BUDGET", 0.5))
+
+# Optional libraries and features only imported when they are used; brotli
+# isn't listed as urllib3 imports it when installed.
+LAZY_MODULES = ["yaml", "msgpack", "orjson", "ujson", "sqlite3", "multiprocessing", "mmap",
+                "slumber.balancer", "slumber.bulk", "slumber.cache", "slumber.compression", "slumber.connection",
+                "slumber.download", "slumber.hedging", "slumber.instrumentation", "slumber.pagination",
+                "slumber.parallel", "slumber.ratelimit", "slumber.retry", "slumber.singleflight"]
+
+
+def import_times():
+    """
+    Returns the cumulative time, in microseconds, spent importing each
+    module by a fresh interpreter running ``import slumber``.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(slumber.__file__))))
+    process = subprocess.Popen([sys.executable, "-X", "importtime", "-c", "import slumber"], env=env,
+                               stderr=subprocess.PIPE)
+    _, output = process.communicate()
+    times = {}
+    for line in output.decode("utf-8").splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "-X importtime needs Python 3.7")
+class ImportTimeTestCase(unittest.TestCase):
+
+    def test_lazy_modules(self):
+        times = import_times()
+        self.assertIn("slumber", times)
+        self.assertEqual([name for name in LAZY_MODULES if name in times], [])
+
+    def test_budget(self):
+        # The best of a few runs, to leave out the noise of a busy machine.
+        best = None
+        for _ in range(3):
+            times = import_times()
+            ratio = (times["slumber"] - times["requests"]) / float(times["requests"])
+            best = ratio if best is None else min(best, ratio)
+        self.assertTrue(best <= IMPORT_BUDGET, "import slumber took %.0f%% of the time importing requests takes, "
+                                               "over %.0f%%" % (best * 100, IMPORT_BUDGET * 100))
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime, mock, unittest, requests
+import slumber, slumber.instrumentation
+import mocks
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session),
+                               listeners=[self.events.append])
+        self.session = self.api._store["session"]
+
+    def test_event(self):
+        self.session.request.return_value = mocks.response(200, elapsed=datetime.timedelta(milliseconds=20))
+
+        self.assertEqual(self.api.users(42).posts.get(), {"ok": True})
+
+        event, = self.events
+        self.assertEqual(event.method, "GET")
+        self.assertEqual(event.url, "http://example/api/v1/users/42/posts/")
+        self.assertEqual(event.url_template, "http://example/api/v1/users/{id}/posts")
+        self.assertEqual(event.status_code, 200)
+        self.assertEqual((event.bytes_sent, event.bytes_received), (0, 12))
+        self.assertEqual((event.attempts, event.retries), (1, 0))
+        self.assertEqual(event.time_to_headers, 0.02)
+        for name in ("serialize_time", "request_time", "deserialize_time"):
+            self.assertTrue(getattr(event, name) >= 0)
+        self.assertTrue(event.error is None)
+
+    def test_templates(self):
+        self.assertEqual(self.api.users("me")._store.template, "http://example/api/v1/users/{id}")
+        self.assertEqual(self.api.users.me._store.template, "http://example/api/v1/users/me")
+        self.assertEqual(self.api.users(1, format="yaml")._store.template, "http://example/api/v1/users/{id}")
+
+    def test_error(self):
+        self.session.request.return_value = mocks.response(404, content=b"",
+                                                           elapsed=datetime.timedelta(milliseconds=20))
+        self.assertRaises(slumber.exceptions.HttpClientError, self.api.users.post, {"name": "a"})
+
+        event, = self.events
+        self.assertEqual(event.status_code, 404)
+        self.assertTrue(isinstance(event.error, slumber.exceptions.HttpClientError))
+        self.assertTrue(event.bytes_sent > 0)
+
+        self.session.request.side_effect = requests.ConnectionError()
+        self.assertRaises(requests.ConnectionError, self.api.users.get)
+        self.assertTrue(isinstance(self.events[1].error, requests.ConnectionError))
+        self.assertTrue(self.events[1].status_code is None)
+
+    def test_deserialize_error(self):
+        self.session.request.return_value = mocks.response(200, content=b"{",
+                                                           elapsed=datetime.timedelta(milliseconds=20))
+        self.assertRaises(ValueError, self.api.users.get)
+
+        event, = self.events
+        self.assertEqual(event.status_code, 200)
+        self.assertTrue(isinstance(event.error, ValueError))
+        self.assertTrue(event.deserialize_time >= 0)
+
+    def test_aggregator(self):
+        aggregator = slumber.instrumentation.HistogramAggregator()
+        self.api.add_listener(aggregator)
+        self.session.request.return_value = mocks.response(200, elapsed=datetime.timedelta(milliseconds=20))
+
+        for id in range(3):
+            self.api.users(id).get()
+        self.api.users.delete()
+
+        stats = aggregator.stats()
+        self.assertEqual(sorted(stats), ["DELETE http://example/api/v1/users", "GET http://example/api/v1/users/{id}"])
+        endpoint = stats["GET http://example/api/v1/users/{id}"]
+        self.assertEqual((endpoint["requests"], endpoint["errors"], endpoint["bytes_received"]), (3, 0, 36))
+        self.assertEqual(endpoint["request_time"]["count"], 3)
+        self.assertEqual(len(self.events), 4)
+
+
+class HistogramTestCase(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = slumber.instrumentation.Histogram(precision=0.01)
+        for value in range(1, 1001):
+            histogram.add(value / 1000.0)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.percentile(100), 1.0)
+        for point in (50, 90, 99):
+            self.assertAlmostEqual(histogram.percentile(point), point / 100.0, delta=point / 100.0 * 0.01)
+        self.assertTrue(slumber.instrumentation.Histogram().percentile(50) is None)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Mocks shared by the test modules.
+"""
+
+from __future__ import unicode_literals
+
+import mock, requests
+
+
+def response(status_code=200, content='{"ok": true}', headers=None, **attributes):
+    """
+    Returns a mock requests.Response with a JSON content type, ``headers``
+    added to it.
+    """
+    r = mock.Mock(spec=requests.Response)
+    r.status_code = status_code
+    r.reason, r.url, r.text = "Reason", "http://example/api/v1/test/", ""
+    r.headers = {"content-type": "application/json"}
+    r.headers.update(headers or {})
+    r.content = content
+    for name, value in attributes.items():
+        setattr(r, name, value)
+    return r
+
+
+def session():
+    """
+    Returns a mock requests.Session with the attributes read by API.
+    """
+    s = mock.Mock(spec=requests.Session)
+    s.auth, s.headers, s.cookies = None, {}, requests.cookies.RequestsCookieJar()
+    return s
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, mock, time, unittest, requests
+import slumber, slumber.pagination, slumber.parallel
+
+
+class PaginationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session))
+        self.session = self.api._store["session"]
+        self.session.request.side_effect = self.request
+        self.calls = []
+
+    def request(self, method, url, params=None, **kwargs):
+        self.calls.append((url, params))
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 2))
+        objects = list(range(5))[offset:offset + limit]
+        page = {"meta": {"next": None}, "objects": objects}
+        if offset + limit < 5:
+            page["meta"]["next"] = "/api/v1/thing/?offset=%d&limit=%d" % (offset + limit, limit)
+            page["next_cursor"] = offset + limit
+
+        r = mock.Mock(spec=requests.Response)
+        r.status_code = 200
+        r.headers = {"content-type": "application/json"}
+        r.content = json.dumps(page)
+        return r
+
+    def test_next_url(self):
+        for prefetch in (0, 1, 3):
+            self.calls = []
+            self.assertEqual(list(self.api.thing.iterate(prefetch=prefetch, limit=2)), [0, 1, 2, 3, 4])
+            self.assertEqual(self.calls, [
+                ("http://example/api/v1/thing/", {"limit": 2}),
+                ("http://example/api/v1/thing/", {"offset": "2", "limit": "2"}),
+                ("http://example/api/v1/thing/", {"offset": "4", "limit": "2"}),
+            ])
+
+    def test_offset(self):
+        paginator = slumber.pagination.OffsetPaginator(limit=3)
+        self.assertEqual(list(self.api.thing.iterate(paginator=paginator)), [0, 1, 2, 3, 4])
+        self.assertEqual([params for url, params in self.calls], [{"limit": 3}, {"limit": 3, "offset": 3}])
+
+    def test_cursor(self):
+        paginator = slumber.pagination.CursorPaginator(cursor_param="offset")
+        self.assertEqual(list(self.api.thing.iterate(paginator=paginator, prefetch=0)), [0, 1, 2, 3, 4])
+        self.assertEqual(len(self.calls), 3)
+
+    def test_prefetch_depth(self):
+        produced = []
+
+        def pages():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        iterator = slumber.parallel.prefetch(pages(), depth=2)
+        self.assertEqual(next(iterator), 0)
+        time.sleep(0.1)
+        self.assertEqual(produced, [0, 1, 2])
+        iterator.close()
+
+    def test_prefetch_error(self):
+        def pages():
+            yield 1
+            raise slumber.exceptions.HttpServerError(mock.Mock(status_code=500, reason="", url="", text=""))
+
+        iterator = slumber.parallel.prefetch(pages())
+        self.assertEqual(next(iterator), 1)
+        self.assertRaises(slumber.exceptions.HttpServerError, next, iterator)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, mock, os, pickle, unittest, requests
+import slumber, slumber.instrumentation, slumber.retry, slumber.transport
+
+
+def make_response(status_code, data):
+    r = requests.Response()
+    r.status_code, r.reason, r.url = status_code, "Reason", "http://example/api/v1/thing/"
+    r.headers["content-type"] = "application/json"
+    r._content = json.dumps(data).encode("utf-8")
+    return r
+
+
+def get_name(item):
+    return "%s %s" % (item["name"], os.getpid())
+
+
+class PickleTestCase(unittest.TestCase):
+
+    def test_pickle(self):
+        aggregator = slumber.instrumentation.HistogramAggregator()
+        api = slumber.API("http://example/api/v1/", auth=("user", "pass"), cache=True,
+                          retry=slumber.retry.RetryPolicy(), single_flight=True, compress_requests=True, rate_limit=5,
+                          listeners=[aggregator], transport=slumber.transport.Urllib3Transport())
+        api._store["retry"].count("retries")
+
+        resource = pickle.loads(pickle.dumps(api.thing(1), 2))
+        store = resource._store
+
+        self.assertEqual(store.base_url, "http://example/api/v1/thing/1")
+        self.assertEqual(store.template, "http://example/api/v1/thing/{id}")
+        self.assertEqual(store["session"].auth, ("user", "pass"))
+        self.assertFalse(store["session"] is api._store["session"])
+        self.assertEqual(store["retry"].retries, 0)
+        self.assertEqual(store["rate_limit"].stats()["rates"], {"*": 5.0})
+        self.assertEqual(store["listeners"][0].stats(), {})
+        self.assertEqual(store["transport"].pool_options["maxsize"], 10)
+
+        # The copy shares its settings with the resources made from it.
+        self.assertTrue(resource.other._store.shared is store.shared)
+
+    def test_pickle_error(self):
+        error = slumber.exceptions.HttpClientError(make_response(404, {}))
+
+        self.assertEqual(str(pickle.loads(pickle.dumps(error, 2))), str(error))
+
+
+class ForkTestCase(unittest.TestCase):
+
+    def test_reset_pools(self):
+        api = slumber.API("http://example/api/v1/")
+        adapter = api._store["session"].get_adapter("http://example/")
+        poolmanager = adapter.poolmanager
+
+        api._store.get_session()
+        self.assertTrue(adapter.poolmanager is poolmanager)
+
+        with mock.patch("slumber.os.getpid", return_value=os.getpid() + 1):
+            session = api.thing._store.get_session()
+        self.assertTrue(session is api._store["session"])
+        self.assertFalse(adapter.poolmanager is poolmanager)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 10)
+
+    def test_map_process(self):
+        api = slumber.API("http://example/api/v1/", session=mock.Mock(spec=requests.Session))
+
+        def request(method, url, **kwargs):
+            if url.endswith("/3/"):
+                return make_response(404, {})
+            return make_response(200, {"name": url.split("/")[-2]})
+        api._store["session"].request.side_effect = request
+
+        results = api.thing.map_process(get_name, [1, 2, 3], processes=2)
+
+        self.assertEqual([r.split()[0] for r in results[:2]], ["1", "2"])
+        self.assertFalse(str(os.getpid()) in results[0])
+        self.assertTrue(isinstance(results[2], slumber.exceptions.HttpClientError))
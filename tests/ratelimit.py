@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import mock, unittest, requests
+import slumber, slumber.ratelimit, slumber.retry
+import mocks
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.multiple("slumber.ratelimit.time", time=self.clock.time, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.limiter = slumber.ratelimit.RateLimiter(rate=10, burst=2, limits={"/api/v1/search/": 1})
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session),
+                               rate_limit=self.limiter)
+        self.session = self.api._store["session"]
+        self.session.request.return_value = mocks.response(200)
+
+    def test_rate(self):
+        for _ in range(12):
+            self.api.test.get()
+        # The burst goes through right away, then one request every 100ms.
+        self.assertAlmostEqual(self.clock.now, 1001.0)
+        self.assertAlmostEqual(self.limiter.waited, 1.0)
+
+        for _ in range(3):
+            self.api.search.get()
+        self.assertAlmostEqual(self.clock.now, 1003.0)
+
+    def test_requeue_429(self):
+        self.session.request.side_effect = (mocks.response(429, headers={"retry-after": "3"}), mocks.response(200))
+
+        self.assertEqual(self.api.test.get(), {"ok": True})
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertAlmostEqual(self.clock.now, 1003.0)
+
+        stats = self.limiter.stats()
+        self.assertEqual((stats["requests"], stats["throttled"], stats["requeued"]), (2, 1, 1))
+        self.assertEqual(stats["rates"]["*"], 5.0 + 0.5)
+        self.assertEqual(stats["queued"], 0)
+
+    def test_max_requeues(self):
+        self.limiter.max_requeues = 1
+        self.session.request.return_value = mocks.response(429)
+
+        self.assertRaises(slumber.exceptions.HttpClientError, self.api.test.get)
+        self.assertEqual(self.session.request.call_count, 2)
+
+    def test_retry_429(self):
+        self.limiter.max_requeues = 2
+        self.api._store["retry"] = slumber.retry.RetryPolicy(total=3)
+        self.session.request.return_value = mocks.response(429)
+
+        self.assertRaises(slumber.exceptions.HttpClientError, self.api.test.get)
+        self.assertEqual(self.session.request.call_count, 3)
+
+    def test_bool(self):
+        self.assertRaises(slumber.exceptions.ImproperlyConfigured, slumber.API, "http://example/api/v1/",
+                          rate_limit=True)
+
+    def test_rate_limit_headers(self):
+        self.session.request.return_value = mocks.response(200, headers={"x-ratelimit-remaining": "6",
+                                                                         "x-ratelimit-reset": "2"})
+        self.api.test.get()
+        self.assertEqual(self.limiter.stats()["rates"]["*"], 3.0)
+
+        self.session.request.return_value = mocks.response(200, headers={"x-ratelimit-remaining": "0",
+                                                                         "x-ratelimit-reset": str(self.clock.now + 30)})
+        self.api.test.get()
+        self.api.test.get()
+        self.assertTrue(self.clock.now >= 1030.0)
+
+    def test_not_adaptive(self):
+        self.limiter.adaptive = False
+        self.session.request.side_effect = (mocks.response(429), mocks.response(200))
+
+        self.api.test.get()
+        self.assertEqual(self.limiter.stats()["rates"]["*"], 10.0)
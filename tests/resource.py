@@ -2,7 +2,7 @@
 
 from __future__ import unicode_literals
 
-import mock, unittest, requests
+import io, json, mock, unittest, requests
 import slumber, slumber.serialize
 
 
@@ -295,3 +295,123 @@ class ResourceTestCase(unittest.TestCase):
 
         if not isinstance(r, dict):
             self.fail("Serialization did not take place")
+
+    def test_get_many(self):
+        def request(method, url, **kwargs):
+            r = mock.Mock(spec=requests.Response)
+            r.status_code = 404 if url.endswith("/2") else 200
+            r.headers = {"content-type": "application/json"}
+            r.content = '{"url": "%s"}' % url
+            r.reason, r.url, r.text = "Not Found", url, ""
+            return r
+
+        self.base_resource._store.update({
+            "session": mock.Mock(spec=requests.Session),
+            "serializer": slumber.serialize.Serializer(),
+        })
+        self.base_resource._store["session"].request.side_effect = request
+
+        results = self.base_resource.get_many(range(5), max_workers=3)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[4], {"url": "http://example/api/v1/test/4"})
+        self.assertTrue(isinstance(results[2], slumber.exceptions.HttpClientError))
+
+        results = self.base_resource.delete_many([1, 2], max_workers=2)
+        self.assertEqual(results[0], True)
+        self.assertTrue(isinstance(results[1], slumber.exceptions.HttpClientError))
+
+    def test_iter_items(self):
+        r = mock.Mock(spec=requests.Response)
+        r.status_code = 200
+        r.headers = {"content-type": "application/json"}
+        r.iter_content.return_value = iter([b'{"meta": {}, "obj', b'ects": [{"id": 1}, ', b'{"id": 2}]}'])
+
+        self.base_resource._store.update({
+            "session": mock.Mock(spec=requests.Session),
+            "serializer": slumber.serialize.Serializer(),
+        })
+        self.base_resource._store["session"].request.return_value = r
+
+        items = list(self.base_resource.iter_items(path="objects", limit=2))
+
+        self.assertEqual(items, [{"id": 1}, {"id": 2}])
+        self.assertTrue(r.close.called)
+        self.assertEqual(self.base_resource._store["session"].request.call_args[1]["stream"], True)
+        self.assertEqual(self.base_resource._store["session"].request.call_args[1]["params"], {"limit": 2})
+
+    def test_post_stream(self):
+        r = mock.Mock(spec=requests.Response)
+        r.status_code = 204
+        r.headers = {}
+
+        self.base_resource._store.update({
+            "session": mock.Mock(spec=requests.Session),
+            "serializer": slumber.serialize.Serializer(),
+        })
+        self.base_resource._store["session"].request.return_value = r
+
+        self.base_resource.post({"id": i} for i in range(3))
+        data = self.base_resource._store["session"].request.call_args[1]["data"]
+        self.assertFalse(isinstance(data, (bytes, list)))
+        self.assertEqual(json.loads(b"".join(data).decode("utf-8")), [{"id": 0}, {"id": 1}, {"id": 2}])
+
+        fp = io.BytesIO(b'{"id": 1}')
+        self.base_resource.put(fp)
+        self.assertTrue(self.base_resource._store["session"].request.call_args[1]["data"] is fp)
+
+
+class NavigationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session))
+
+    def test_memoized_children(self):
+        self.assertTrue(self.api.a.b._store is self.api.a.b._store)
+        # The resources themselves, which hold the last response, are not shared.
+        self.assertTrue(self.api.a.b is not self.api.a.b)
+        self.assertTrue(self.api.a(1) is not self.api.a(1))
+        self.assertEqual(self.api.a(1)._store.template, self.api.a(2)._store.template)
+        self.assertEqual(self.api.a(1).b._store["base_url"], "http://example/api/v1/a/1/b")
+        self.assertEqual(self.api.a(format="yaml")._store["format"], "yaml")
+        self.assertEqual(self.api.a._store["format"], "json")
+
+    def test_last_response_not_memoized(self):
+        r = mock.Mock(spec=requests.Response)
+        r.status_code = 200
+        r.headers = {"content-type": "application/json"}
+        r.content = '{"result": 1}'
+        self.api._store["session"].request.return_value = r
+
+        resource = self.api.a
+        self.assertEqual(resource.get(), {"result": 1})
+        self.assertTrue(resource._ is r)
+        self.assertFalse(hasattr(self.api.a, "_"))
+
+    def test_subclass(self):
+        class CountingResource(slumber.Resource):
+            def __init__(self, **kwargs):
+                super(CountingResource, self).__init__(**kwargs)
+                self.calls = 0
+
+        class CountingAPI(slumber.API):
+            resource_class = CountingResource
+
+        api = CountingAPI(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session))
+        self.assertEqual(api.thing.calls, 0)
+        self.assertEqual(api.thing(1).sub.calls, 0)
+        self.assertEqual(api.thing(1).sub._store["base_url"], "http://example/api/v1/thing/1/sub")
+        self.assertEqual(api.thing(1).sub._store.template, "http://example/api/v1/thing/{id}/sub")
+
+    def test_shared_settings(self):
+        resource = self.api.a.b
+        self.assertTrue(resource._store.shared is self.api._store.shared)
+        self.assertFalse(hasattr(resource, "__dict__"))
+
+        self.api._store["token"] = {"token_type": "Bearer", "access_token": "abc"}
+        self.assertEqual(self.api.a.b._store["token"]["access_token"], "abc")
+        self.assertEqual(resource._store["token"], None)
+
+        self.api.a._store.update({"append_slash": False})
+        self.assertEqual(self.api.a.b._store["append_slash"], False)
+        self.assertEqual(self.api.c._store["append_slash"], True)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import mock, unittest, requests
+import slumber, slumber.retry
+import mocks
+
+
+@mock.patch("slumber.retry.time.sleep")
+class RetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = slumber.retry.RetryPolicy(total=2, backoff_factor=1, jitter=False)
+        self.breaker = slumber.retry.CircuitBreaker(failure_threshold=5, recovery_timeout=60)
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session),
+                               retry=self.policy, circuit_breaker=self.breaker)
+        self.session = self.api._store["session"]
+
+    def test_retry_then_success(self, sleep):
+        responses = (mocks.response(503), requests.ConnectionError(), mocks.response(200))
+        self.session.request.side_effect = responses
+
+        self.assertEqual(self.api.test.get(), {"ok": True})
+        # Only the retried response is closed.
+        self.assertEqual((responses[0].close.call_count, responses[2].close.call_count), (1, 0))
+        self.assertEqual([c[0][0] for c in sleep.call_args_list], [1, 2])
+        self.assertEqual(self.policy.stats(), {"attempts": 3, "retries": 2, "exhausted": 0})
+
+    def test_retry_after(self, sleep):
+        self.session.request.side_effect = (mocks.response(429, headers={"retry-after": "7"}), mocks.response(200))
+
+        self.api.test.get()
+        sleep.assert_called_once_with(7)
+
+        # Longer waits than max_backoff are not retried.
+        self.session.request.side_effect = None
+        self.session.request.return_value = mocks.response(429, headers={"retry-after": "86400"})
+        self.assertRaises(slumber.exceptions.HttpClientError, self.api.test.get)
+        sleep.assert_called_once_with(7)
+        self.assertEqual(self.policy.exhausted, 1)
+
+    def test_exhausted(self, sleep):
+        self.session.request.return_value = mocks.response(502)
+
+        self.assertRaises(slumber.exceptions.HttpServerError, self.api.test.get)
+        self.assertEqual(self.session.request.call_count, 3)
+        self.assertEqual(self.policy.exhausted, 1)
+
+    def test_not_retryable(self, sleep):
+        self.session.request.return_value = mocks.response(503)
+
+        self.assertRaises(slumber.exceptions.HttpServerError, self.api.test.post, {"foo": "bar"})
+        self.session.request.return_value = mocks.response(400)
+        self.assertRaises(slumber.exceptions.HttpClientError, self.api.test.put, {})
+        self.assertEqual(self.session.request.call_count, 2)
+        self.assertFalse(sleep.called)
+
+    def test_budget(self, sleep):
+        self.policy.budget = 0.5
+        self.session.request.return_value = mocks.response(503)
+
+        self.assertRaises(slumber.exceptions.HttpServerError, self.api.test.get)
+        self.assertEqual(self.session.request.call_count, 1)
+
+    def test_circuit_breaker(self, sleep):
+        self.api._store["retry"] = None
+        self.breaker.failure_threshold = 2
+        self.session.request.return_value = mocks.response(500)
+
+        for _ in range(2):
+            self.assertRaises(slumber.exceptions.HttpServerError, self.api.test.get)
+        self.assertEqual(self.breaker.get_state("example"), "open")
+        self.assertRaises(slumber.exceptions.CircuitOpenError, self.api.test.get)
+        self.assertEqual(self.session.request.call_count, 2)
+
+        with mock.patch("slumber.retry.time.time", return_value=self.breaker._hosts["example"]["opened_at"] + 61):
+            self.session.request.return_value = mocks.response(200)
+            self.api.test.get()
+
+        self.assertEqual(self.breaker.get_state("example"), "closed")
+        self.assertEqual(self.breaker.stats(), {"opened": 1, "half_opened": 1, "closed": 1, "rejected": 1})
+
+    def test_circuit_breaker_trial_error(self, sleep):
+        self.api._store["retry"] = None
+        self.breaker.failure_threshold = 1
+        self.session.request.return_value = mocks.response(500)
+        self.assertRaises(slumber.exceptions.HttpServerError, self.api.test.get)
+
+        # Any error of the trial request opens the circuit again.
+        opened_at = self.breaker._hosts["example"]["opened_at"]
+        with mock.patch("slumber.retry.time.time", return_value=opened_at + 61):
+            self.session.request.side_effect = requests.exceptions.ChunkedEncodingError()
+            self.assertRaises(requests.exceptions.ChunkedEncodingError, self.api.test.get)
+        self.assertEqual(self.breaker.get_state("example"), "open")
+
+        with mock.patch("slumber.retry.time.time", return_value=opened_at + 200):
+            self.session.request.side_effect = None
+            self.session.request.return_value = mocks.response(200)
+            self.assertEqual(self.api.test.get(), {"ok": True})
+        self.assertEqual(self.breaker.get_state("example"), "closed")
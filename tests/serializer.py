@@ -2,8 +2,8 @@
 
 from __future__ import unicode_literals
 
-import unittest
-import slumber, slumber.serialize
+import importlib, json, math, mock, time, unittest
+import slumber, slumber.parallel, slumber.serialize
 
 
 class ResourceTestCase(unittest.TestCase):
@@ -19,3 +19,111 @@ class ResourceTestCase(unittest.TestCase):
             "text/x-json",
         ]:
             s.get_serializer(content_type=content_type)
+
+    def test_structured_syntax_suffix(self):
+        s = slumber.serialize.Serializer()
+
+        self.assertEqual(s.get_serializer(content_type="application/vnd.api+json").key, "json")
+        self.assertEqual(s.get_serializer(content_type="application/problem+JSON; charset=utf-8").key, "json")
+        self.assertEqual(s.get_serializer(content_type="application/foo+yaml").key, "yaml")
+        self.assertRaises(slumber.exceptions.SerializerNotAvailable, s.get_serializer,
+                          content_type="application/foo+xml")
+
+    def test_json_backends(self):
+        data = {"a": [1, 2.5, None, True], "tǝst": "value"}
+        for backend in ("json", "ujson", "orjson"):
+            try:
+                s = slumber.serialize.JsonSerializer(backend=backend)
+            except slumber.exceptions.SerializerNotAvailable:
+                continue
+            self.assertEqual(s.loads(s.dumps(data)), data)
+            self.assertEqual(s.loads('{"tǝst": 1}'.encode("utf-8")), {"tǝst": 1})
+            self.assertEqual(type(s.dumps(data)), type(json.dumps(data)))
+            # Falls back to the standard library for what orjson can't encode.
+            self.assertEqual(s.loads(s.dumps({1: "a"})), {"1": "a"})
+
+        # The standard library is the default, it keeps big integers and NaN.
+        s = slumber.serialize.JsonSerializer()
+        self.assertEqual(s.backend, "json")
+        self.assertEqual(s.loads("123456789012345678901234567890"), 123456789012345678901234567890)
+        self.assertTrue(math.isnan(s.loads("[NaN]")[0]))
+
+    def test_register(self):
+        class CsvSerializer(slumber.serialize.BaseSerializer):
+            content_types = ["text/csv"]
+            key = "csv"
+
+            def loads(self, data):
+                return data.split(",")
+
+        s = slumber.serialize.Serializer()
+        s.register(CsvSerializer())
+        self.assertEqual(s.get_serializer(content_type="text/csv").loads("a,b"), ["a", "b"])
+        self.assertEqual(s.get_serializer(content_type="application/json").key, "json")
+
+        # Serializers set in the dict directly are used too.
+        s = slumber.serialize.Serializer()
+        s.serializers["csv"] = CsvSerializer()
+        self.assertEqual(s.get_serializer("csv").key, "csv")
+        self.assertEqual(s.get_serializer(content_type="text/csv").key, "csv")
+
+    def test_lazy(self):
+        with mock.patch.dict(slumber.serialize._MODULES, clear=True), \
+                mock.patch("slumber.serialize.importlib.import_module", wraps=importlib.import_module) as imports:
+            s = slumber.serialize.Serializer()
+            # Available serializers are listed without importing their libraries.
+            self.assertIn("yaml", s.serializers)
+            self.assertIn("yaml", list(s.serializers))
+            self.assertFalse(imports.called)
+
+            self.assertEqual(s.get_serializer(content_type="text/yaml").key, "yaml")
+            self.assertIsInstance(s.serializers["yaml"], slumber.serialize.YamlSerializer)
+            imports.assert_called_once_with("yaml")
+
+        # Serializers whose libraries are missing are skipped.
+        class MissingSerializer(slumber.serialize.BaseSerializer):
+            content_types = ["application/json"]
+            key = "missing"
+            requires = ("not_installed_module",)
+
+        s = slumber.serialize.Serializer(serializers=[MissingSerializer, slumber.serialize.JsonSerializer])
+        self.assertEqual(s.get_serializer(content_type="application/json").key, "json")
+        self.assertRaises(slumber.exceptions.SerializerNotAvailable, s.get_serializer, "missing")
+        self.assertEqual(list(s.serializers), ["json"])
+        self.assertRaises(slumber.exceptions.SerializerNoAvailable, slumber.serialize.Serializer,
+                          serializers=[MissingSerializer])
+
+    def test_concurrent_lookups(self):
+        class SlowSerializer(slumber.serialize.JsonSerializer):
+            key = "slow"
+
+            def __init__(self):
+                time.sleep(0.05)
+                super(SlowSerializer, self).__init__()
+
+        s = slumber.serialize.Serializer(serializers=[SlowSerializer])
+        results = slumber.parallel.thread_map(lambda _: s.get_serializer("slow"), range(8), max_workers=8)
+        self.assertEqual(len(set(id(x) for x in results)), 1)
+        self.assertIsInstance(results[0], SlowSerializer)
+
+    def test_dump_iter(self):
+        items = [{"id": i, "name": "tǝst"} for i in range(100)]
+        s = slumber.serialize.Serializer()
+
+        chunks = list(s.get_serializer("json").dump_iter(iter(items), chunk_size=256))
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(s.loads(b"".join(chunks)), items)
+        self.assertEqual(b"".join(s.dump_iter(iter([]))), b"[]")
+
+        yaml = s.get_serializer("yaml")
+        self.assertEqual(b"".join(yaml.dump_iter(iter(items))), slumber.serialize._to_bytes(yaml.dumps(items)))
+
+    def test_ndjson(self):
+        s = slumber.serialize.Serializer().get_serializer(content_type="application/x-ndjson")
+        items = [{"id": 1}, {"id": 2}, [3]]
+
+        data = s.dumps(items)
+        self.assertEqual(data.count(b"\n"), 3)
+        self.assertEqual(s.loads(data), items)
+        chunks = [data[i:i + 3] for i in range(0, len(data), 3)]
+        self.assertEqual(list(s.iter_loads(chunks)), items)
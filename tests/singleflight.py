@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import mock, threading, time, unittest, requests
+import slumber
+import mocks
+
+
+class SingleFlightTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = slumber.API(base_url="http://example/api/v1/", session=mock.Mock(spec=requests.Session),
+                               single_flight=True)
+        self.single_flight = self.api._store["single_flight"]
+        self.release = threading.Event()
+
+    def get_concurrently(self, callers, status_code=200, **kwargs):
+        def request(*args, **kw):
+            self.release.wait(5)
+            return mocks.response(status_code)
+        self.api._store["session"].request.side_effect = request
+
+        results = [None] * callers
+
+        def call(i):
+            try:
+                results[i] = self.api.config("name").get(**kwargs)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while self.single_flight.coalesced < callers - 1 and time.time() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesced(self):
+        results = self.get_concurrently(5, limit=1)
+
+        self.assertEqual(results, [{"ok": True}] * 5)
+        self.assertEqual(self.api._store["session"].request.call_count, 1)
+        self.assertEqual(self.single_flight.stats(), {"calls": 1, "coalesced": 4})
+        self.assertEqual(self.single_flight.in_flight(), 0)
+
+    def test_errors_are_shared(self):
+        results = self.get_concurrently(3, status_code=404)
+
+        self.assertEqual(self.api._store["session"].request.call_count, 1)
+        for result in results:
+            self.assertTrue(isinstance(result, slumber.exceptions.HttpClientError))
+
+    def test_keys(self):
+        resource = self.api.config("name")
+        self.assertNotEqual(resource._get_flight_key({"a": 1}), resource._get_flight_key({"a": 2}))
+        self.assertEqual(resource._get_flight_key({"a": 1}), self.api.config("name")._get_flight_key({"a": 1}))
+
+        key = resource._get_flight_key({})
+        resource._store["token"] = {"token_type": "Bearer", "access_token": "abc"}
+        self.assertNotEqual(resource._get_flight_key({}), key)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        self.release.set()
+        self.api._store["session"].request.return_value = mocks.response(200)
+
+        self.api.config.get()
+        self.api.config.get()
+        self.assertEqual(self.single_flight.stats(), {"calls": 2, "coalesced": 0})
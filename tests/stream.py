@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, unittest
+import slumber.stream
+
+
+def chunked(text, size):
+    data = text.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class JsonArrayTestCase(unittest.TestCase):
+
+    def test_top_level(self):
+        items = [1, 2.5, "tǝst", None, True, {"a": [1, 2]}, [], 12345678]
+        for size in (1, 3, 7, 1000):
+            self.assertEqual(list(slumber.stream.iter_json_array(chunked(json.dumps(items), size))), items)
+
+    def test_nested_path(self):
+        document = {
+            "meta": {"next": "/api/v1/test/?offset=2", "skip": ["]", "}\\\"", {"deep": [[]]}]},
+            "objects": [{"id": 1}, {"id": 2}],
+        }
+        for size in (1, 5, 1000):
+            items = slumber.stream.iter_json_array(chunked(json.dumps(document), size), path="objects")
+            self.assertEqual(list(items), [{"id": 1}, {"id": 2}])
+
+        items = slumber.stream.iter_json_array(chunked(json.dumps(document), 4), path=["meta", "skip"])
+        self.assertEqual(list(items), document["meta"]["skip"])
+
+    def test_empty_and_missing(self):
+        self.assertEqual(list(slumber.stream.iter_json_array([b" [ ] "])), [])
+        self.assertRaises(KeyError, list, slumber.stream.iter_json_array([b'{"a": []}'], path="b"))
+        self.assertRaises(ValueError, list, slumber.stream.iter_json_array([b'[1, 2']))
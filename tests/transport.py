@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json, mock, os, pickle, requests, shutil, tempfile, threading, unittest
+import BaseHTTPServer
+import slumber, slumber.transport
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def respond(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/api/missing/"):
+            return self.respond(404, b"{}")
+        if self.path.startswith("/api/moved/"):
+            self.send_response(302)
+            self.send_header("Location", "/api/things/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = {"path": self.path, "authorization": self.headers.get("Authorization"), "objects": [1, 2, 3],
+                "api_key": self.headers.get("X-Api-Key"), "user_agent": self.headers.get("User-Agent")}
+        self.respond(200, json.dumps(body).encode("utf-8"))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers["Content-Type"].startswith("multipart/form-data"):
+            body = json.dumps({"size": len(body)}).encode("utf-8")
+        self.respond(201, body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = "http://127.0.0.1:%d/api/" % self.server.server_address[1]
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "recording.jsonl.gz")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+
+class Urllib3TransportTestCase(ServerTestCase):
+
+    def setUp(self):
+        super(Urllib3TransportTestCase, self).setUp()
+        self.api = slumber.API(self.url, auth=("user", "pass"), transport=slumber.transport.Urllib3Transport())
+
+    def tearDown(self):
+        self.api._store["transport"].close()
+        super(Urllib3TransportTestCase, self).tearDown()
+
+    def test_get(self):
+        result = self.api.things.get(a=1, b=["x", "y"], c=None)
+
+        self.assertEqual(result["path"], "/api/things/?a=1&b=x&b=y")
+        self.assertEqual(result["authorization"], "Basic dXNlcjpwYXNz")
+        self.assertEqual(self.api.moved.get()["path"], "/api/things/")
+        self.assertEqual(list(self.api.things.iter_items(path="objects")), [1, 2, 3])
+        self.assertEqual(result["user_agent"], requests.utils.default_user_agent())
+
+    def test_session_headers(self):
+        session = requests.Session()
+        session.headers["X-Api-Key"] = "secret"
+        api = slumber.API(self.url, session=session, transport=slumber.transport.Urllib3Transport())
+        self.assertEqual(api.things.get()["api_key"], "secret")
+
+    def test_auth_callable(self):
+        def auth(request):
+            request.headers["Authorization"] = "Signed %s" % len(request.body or b"")
+            return request
+        session = requests.Session()
+        session.auth = auth
+        api = slumber.API(self.url, session=session, transport=slumber.transport.Urllib3Transport())
+        self.assertEqual(api.things.get()["authorization"], "Signed 0")
+
+        session.auth = requests.auth.HTTPDigestAuth("user", "pass")
+        api = slumber.API(self.url, session=session, transport=slumber.transport.Urllib3Transport())
+        self.assertRaises(slumber.exceptions.ImproperlyConfigured, api.things.get)
+
+        session.auth = "user:pass"
+        self.assertRaises(slumber.exceptions.ImproperlyConfigured, slumber.API, self.url, session=session,
+                          transport=slumber.transport.Urllib3Transport())
+
+    def test_timeout(self):
+        transport = slumber.transport.Urllib3Transport(timeout=(1, 5))
+        with mock.patch.object(transport, "get_poolmanager") as get_poolmanager:
+            transport.request("GET", self.url)
+        timeout = get_poolmanager.return_value.urlopen.call_args[1]["timeout"]
+        self.assertEqual((timeout.connect_timeout, timeout.read_timeout, timeout.total), (1, 5, None))
+
+    def test_post(self):
+        self.assertEqual(self.api.things.post({"name": "tǝst"}), {"name": "tǝst"})
+        self.assertTrue(self.api.things.post(files={"file": ("a.txt", b"content")})["size"] > 7)
+
+    def test_errors(self):
+        self.assertRaises(slumber.exceptions.HttpClientError, self.api.missing.get)
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.api._store["transport"].close()
+        self.assertRaises(requests.ConnectionError, self.api.things.get)
+
+
+class RecordReplayTestCase(ServerTestCase):
+
+    def record(self):
+        recorder = slumber.transport.RecordingTransport(self.path)
+        api = slumber.API(self.url, transport=recorder, token={"token_type": "Bearer", "access_token": "secret"})
+        results = [api.things.get(page=2), api.things.post({"name": "a"}), api.things.post({"name": "b"})]
+        recorder.close()
+        api._store["session"].close()
+        return results
+
+    def test_replay(self):
+        recorded = self.record()
+        self.server.shutdown()
+
+        replayer = slumber.transport.ReplayTransport(self.path)
+        api = slumber.API(self.url, transport=replayer)
+        self.assertEqual([api.things.get(page=2), api.things.post({"name": "a"}), api.things.post({"name": "b"})],
+                         recorded)
+        self.assertEqual(list(api.things.iter_items(path="objects", page=2)), [1, 2, 3])
+        self.assertRaises(slumber.exceptions.ReplayMissError, api.things.get, page=3)
+
+    def test_recording(self):
+        self.record()
+        replayer = slumber.transport.ReplayTransport(self.path)
+
+        exchanges = [e for exchanges in replayer._exchanges.values() for e in exchanges]
+        self.assertEqual(len(exchanges), 3)
+        for exchange in exchanges:
+            self.assertFalse("Authorization" in exchange["request_headers"])
+            self.assertFalse("Content-Length" in exchange["headers"])
+            self.assertTrue(exchange["elapsed"] > 0)
+
+    def test_recording_stream(self):
+        recorder = slumber.transport.RecordingTransport(self.path, transport=slumber.transport.Urllib3Transport())
+        api = slumber.API(self.url, transport=recorder)
+        self.assertEqual(list(api.things.iter_items(path="objects", page=1)), [1, 2, 3])
+        recorder.request("GET", self.url + "things/", params={"page": 2}, stream=True).close()
+        self.assertEqual(api.things.get(page=3)["objects"], [1, 2, 3])
+        recorder.close()
+
+        replayer = slumber.transport.ReplayTransport(self.path)
+        self.assertEqual(sorted(key[1] for key in replayer._exchanges),
+                         [self.url + "things/?page=1", self.url + "things/?page=3"])
+        api = slumber.API(self.url, transport=replayer)
+        self.assertEqual(list(api.things.iter_items(path="objects", page=1)), [1, 2, 3])
+
+    def test_pickle(self):
+        recorder = slumber.transport.RecordingTransport(self.path, transport=requests.Session())
+        recorder = pickle.loads(pickle.dumps(recorder, 2))
+        api = slumber.API(self.url, transport=recorder)
+        recorded = api.things.get(page=2)
+        recorder.close()
+
+        replayer = pickle.loads(pickle.dumps(slumber.transport.ReplayTransport(self.path, latency=0.5), 2))
+        self.assertEqual(replayer.latency, 0.5)
+        with mock.patch("slumber.transport.time.sleep"):
+            self.assertEqual(slumber.API(self.url, transport=replayer).things.get(page=2), recorded)
+
+    def test_latency(self):
+        self.record()
+        replayer = slumber.transport.ReplayTransport(self.path, latency=2)
+        api = slumber.API(self.url, transport=replayer)
+
+        with mock.patch("slumber.transport.time.sleep") as sleep:
+            api.things.get(page=2)
+        exchange, = replayer._exchanges[("GET", self.url + "things/?page=2", None)]
+        sleep.assert_called_once_with(exchange["elapsed"] * 2)